@@ -571,7 +571,7 @@ async function fetchScannerResults(req, res) {
 
     const { data: scanData, error: scanError } = await supabase
       .from("file_snapshots")
-      .select("scannerResults")
+      .select("scannerResults, resultsHash")
       .eq("repoSnapshotId", repoId)
       .eq("filePath", filePath)
       .single();
@@ -584,8 +584,27 @@ async function fetchScannerResults(req, res) {
       );
     }
 
+    // Newer snapshots reference deduplicated results by content hash
+    let scanResults = scanData?.scannerResults || null;
+    if (!scanResults && scanData?.resultsHash) {
+      const { data: resultsData, error: resultsError } = await supabase
+        .from("scanner_results")
+        .select("results")
+        .eq("hash", scanData.resultsHash)
+        .single();
+
+      if (resultsError) {
+        throw new RepoError(
+          "Failed to fetch scan data",
+          500,
+          "SCAN_DATA_FETCH_ERROR"
+        );
+      }
+      scanResults = resultsData?.results || null;
+    }
+
     return res.status(200).json({
-      scanResults: scanData?.scannerResults || null,
+      scanResults,
     });
   } catch (error) {
     return handleError(error, res);
@@ -0,0 +1,209 @@
+from typing import Dict, Any, List, Iterator, Tuple
+from pathlib import Path
+import argparse
+import json
+import os
+import re
+import sqlite3
+from packaging.version import Version, InvalidVersion
+
+SCHEMA = """
+CREATE TABLE advisories (
+    ecosystem TEXT NOT NULL,
+    package TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    advisory_id TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    summary TEXT NOT NULL
+);
+CREATE INDEX advisories_package ON advisories (ecosystem, package);
+"""
+
+_RELEASE = re.compile(r'^v?(\d+(?:\.\d+)*)(.*)$')
+_SEMVER = re.compile(r'^v?(\d+(?:\.\d+)*)(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]*)?$')
+_CLAUSE = re.compile(r'^(===|==|!=|<=|>=|<|>)?\s*(.+)$')
+
+def normalize_package(ecosystem: str, name: str) -> str:
+    """Canonical package name, so lookups match however a manifest spells it"""
+    if ecosystem == 'pypi':
+        return re.sub(r'[-_.]+', '-', name).lower()
+    return name.lower()
+
+def _release(numbers: str) -> Tuple[int, ...]:
+    release = [int(part) for part in numbers.split('.')]
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+    return tuple(release)
+
+def version_key(version: str, ecosystem: str) -> Tuple:
+    """Sortable key for a version under its ecosystem's rules. PyPI follows PEP 440, so post-releases
+    and local versions sort after their release; npm follows semver precedence. Unparseable versions
+    sort below every valid one."""
+    version = version.strip()
+    if ecosystem == 'pypi':
+        try:
+            return (1, Version(version), '')
+        except InvalidVersion:
+            return (0, Version('0'), version)
+
+    match = _SEMVER.match(version)
+    if not match:
+        # Loose versions: compare the leading numbers, then the rest as text
+        loose = _RELEASE.match(version)
+        if not loose:
+            return (0, (), 0, (), version)
+        return (1, _release(loose.group(1)), 0, ((1, 0, loose.group(2)),), '')
+    pre = match.group(2)
+    if pre is None:
+        return (1, _release(match.group(1)), 1, (), '')
+    # Numeric identifiers compare numerically and rank below alphanumeric ones
+    identifiers = tuple((0, int(part), '') if part.isdigit() else (1, 0, part) for part in pre.split('.'))
+    return (1, _release(match.group(1)), 0, identifiers, '')
+
+def version_matches(version: str, spec: str, ecosystem: str) -> bool:
+    """Check a version against a comma-separated constraint list such as '>=1.0,<1.4.2'"""
+    for clause in spec.split(','):
+        clause = clause.strip()
+        if not clause:
+            continue
+        match = _CLAUSE.match(clause)
+        op, bound = match.group(1) or '==', match.group(2).strip()
+
+        if bound.endswith('.*') and op in ('==', '!='):
+            prefix = bound[:-2]
+            inside = version == prefix or version.startswith(prefix + '.')
+            if inside != (op == '=='):
+                return False
+            continue
+
+        left, right = version_key(version, ecosystem), version_key(bound, ecosystem)
+        holds = {
+            '<': left < right,
+            '<=': left <= right,
+            '>': left > right,
+            '>=': left >= right,
+            '==': left == right,
+            '===': version == bound,
+            '!=': left != right,
+        }[op]
+        if not holds:
+            return False
+    return True
+
+class AdvisoryDatabase:
+    """Read-only view of a compiled advisory database; lookups hit the (ecosystem, package) index"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        self._rows = {} # lockfiles repeat packages, so keep what was already fetched
+
+    def lookup(self, ecosystem: str, package: str, version: str) -> List[Dict[str, Any]]:
+        """Advisories affecting this exact package version"""
+        key = (ecosystem, normalize_package(ecosystem, package))
+        if key not in self._rows:
+            self._rows[key] = self.conn.execute(
+                "SELECT spec, advisory_id, severity, summary FROM advisories WHERE ecosystem = ? AND package = ?",
+                key
+            ).fetchall()
+
+        matches = {}
+        for spec, advisory_id, severity, summary in self._rows[key]:
+            if advisory_id not in matches and version_matches(version, spec, ecosystem):
+                matches[advisory_id] = {'id': advisory_id, 'severity': severity, 'summary': summary, 'spec': spec}
+        return list(matches.values())
+
+    @staticmethod
+    def compile(sources: List[str], out_path: str) -> int:
+        """Build the indexed database from safety-db and OSV JSON files (or directories of them)"""
+        os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+        tmp_path = f"{out_path}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        conn = sqlite3.connect(tmp_path)
+        conn.executescript(SCHEMA)
+        count = 0
+        for source in sources:
+            paths = sorted(Path(source).rglob('*.json')) if os.path.isdir(source) else [Path(source)]
+            for path in paths:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                rows = list(_rows_from_document(data))
+                conn.executemany("INSERT INTO advisories VALUES (?, ?, ?, ?, ?, ?)", rows)
+                count += len(rows)
+        conn.commit()
+        conn.close()
+
+        # Swap in atomically so running scans never see a half-built database
+        os.replace(tmp_path, out_path)
+        return count
+
+def _rows_from_document(data: Any) -> Iterator[Tuple[str, str, str, str, str, str]]:
+    if isinstance(data, list):
+        for entry in data:
+            yield from _rows_from_document(entry)
+    elif isinstance(data, dict) and 'affected' in data:
+        yield from _rows_from_osv(data)
+    elif isinstance(data, dict):
+        yield from _rows_from_safety(data)
+
+def _rows_from_safety(data: Dict[str, Any]) -> Iterator[Tuple[str, str, str, str, str, str]]:
+    """safety-db insecure_full.json: {package: [{id, advisory, specs: ['<1.2', ...]}]}"""
+    for package, advisories in data.items():
+        if package.startswith('$') or not isinstance(advisories, list):
+            continue
+        for advisory in advisories:
+            advisory_id = advisory.get('cve') or advisory.get('id') or 'unknown'
+            summary = (advisory.get('advisory') or '').strip().splitlines()
+            for spec in advisory.get('specs', []):
+                yield ('pypi', normalize_package('pypi', package), spec, advisory_id, 'MEDIUM', summary[0] if summary else '')
+
+def _rows_from_osv(data: Dict[str, Any]) -> Iterator[Tuple[str, str, str, str, str, str]]:
+    """OSV schema: affected[].ranges[].events become one constraint list per affected range"""
+    severity = str(data.get('database_specific', {}).get('severity') or 'MEDIUM').upper()
+    if severity == 'MODERATE':
+        severity = 'MEDIUM'
+    summary = data.get('summary') or (data.get('details') or '').strip().split('\n')[0]
+
+    for affected in data.get('affected', []):
+        package = affected.get('package', {})
+        ecosystem = str(package.get('ecosystem', '')).lower()
+        name = package.get('name')
+        if not name:
+            continue
+        name = normalize_package(ecosystem, name)
+
+        ranges = [r for r in affected.get('ranges', []) if r.get('type') != 'GIT']
+        if not ranges:
+            # Only an explicit version list to go on
+            for version in affected.get('versions', []):
+                yield (ecosystem, name, f'=={version}', data['id'], severity, summary)
+
+        for affected_range in ranges:
+            opened, lower = False, None
+            for event in affected_range.get('events', []):
+                if 'introduced' in event:
+                    opened = True
+                    lower = None if event['introduced'] == '0' else event['introduced']
+                    continue
+                if not opened:
+                    continue
+                if 'fixed' in event:
+                    upper = f"<{event['fixed']}"
+                elif 'last_affected' in event:
+                    upper = f"<={event['last_affected']}"
+                else:
+                    continue
+                yield (ecosystem, name, f'>={lower},{upper}' if lower else upper, data['id'], severity, summary)
+                opened = False
+            if opened:
+                # Introduced and never fixed: every later version is affected
+                yield (ecosystem, name, f'>={lower}' if lower else '>=0', data['id'], severity, summary)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile advisory feeds into the offline dependency database")
+    parser.add_argument("sources", nargs="+", help="safety-db or OSV JSON files, or directories of them")
+    parser.add_argument("--out", default=os.getenv("ADVISORY_DB_PATH", "./data/advisories.sqlite"), help="Output SQLite path")
+    args = parser.parse_args()
+    print(f"Compiled {AdvisoryDatabase.compile(args.sources, args.out)} advisory ranges into {args.out}")
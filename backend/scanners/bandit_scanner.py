@@ -0,0 +1,124 @@
+from base_scanner import BaseScanner
+from typing import Dict, Any, List
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import logging
+import subprocess
+import time
+import metrics
+
+# Score penalty per finding, scaled by how sure bandit is about it
+SEVERITY_WEIGHTS = {'HIGH': 10, 'MEDIUM': 5, 'LOW': 1}
+CONFIDENCE_WEIGHTS = {'HIGH': 1.0, 'MEDIUM': 0.7, 'LOW': 0.4}
+CHUNK_SIZE = 25 # files handed to a worker per task
+
+_bandit_config = None
+
+def _init_worker():
+    """Load bandit's config and plugins once per pool worker instead of once per file"""
+    global _bandit_config
+    from bandit.core import config as b_config
+    from bandit.core import extension_loader
+
+    logging.getLogger('bandit').setLevel(logging.WARNING)
+    _bandit_config = b_config.BanditConfig()
+    extension_loader.MANAGER # plugin discovery happens on first access
+
+def _scan_chunk(paths: List[str]) -> Dict[str, Any]:
+    """Run bandit's manager in process over a chunk of files"""
+    from bandit.core import manager as b_manager
+
+    if _bandit_config is None:
+        _init_worker()
+
+    results = {path: {'raw': [], 'errors': [], 'score': 100} for path in paths}
+    try:
+        mgr = b_manager.BanditManager(_bandit_config, 'file', quiet=True)
+        mgr.discover_files(paths)
+        mgr.run_tests()
+    except Exception as e:
+        for path in paths:
+            results[path] = {'raw': [], 'errors': [f'Bandit error: {str(e)}'], 'score': 0, 'transient': True}
+        return results
+
+    for fname, reason in mgr.skipped:
+        if fname in results:
+            results[fname]['errors'].append(f'Bandit skipped file: {reason}')
+            results[fname]['score'] = 0
+
+    penalties = {path: 0.0 for path in paths}
+    for issue in sorted(mgr.get_issue_list(), key=lambda i: (i.fname, i.lineno)):
+        if issue.fname not in results:
+            continue
+        results[issue.fname]['raw'].append(
+            f'{issue.lineno}:{issue.col_offset}: [{issue.test_id}:{issue.severity}]: {issue.text} (confidence {issue.confidence.lower()})'
+        )
+        penalties[issue.fname] += SEVERITY_WEIGHTS.get(issue.severity, 1) * CONFIDENCE_WEIGHTS.get(issue.confidence, 1.0)
+
+    for path, penalty in penalties.items():
+        if not results[path]['errors']:
+            results[path]['score'] = max(0, round(100 - penalty, 2))
+
+    return results
+
+class Bandit(BaseScanner):
+    """Python security linting with bandit, run in process inside persistent pool workers"""
+
+    def __init__(self, max_workers=None, exclude_patterns=None):
+        super().__init__(max_workers, exclude_patterns)
+
+    def get_file_extensions(self) -> List[str]:
+        return ['.py']
+
+    def scan_single_file(self, file_path: Path) -> Dict[str, Any]:
+        return _scan_chunk([str(file_path)])
+
+    def scan_batch(self, file_paths: List[Path], batch_size: int = 500) -> Dict[str, Any]:
+        if not file_paths:
+            return {}
+
+        results = {}
+        # One pool for the whole scan, so each worker pays bandit's startup cost once
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker) as executor:
+            for i in range(0, len(file_paths), batch_size):
+                batch = file_paths[i:i + batch_size]
+                results.update(self._checkpointed(batch, lambda chunk: self._scan_chunks(executor, chunk)))
+
+        return results
+
+    def _scan_chunks(self, executor, batch: List[Path]) -> Dict[str, Any]:
+        chunks = [[str(p) for p in batch[j:j + CHUNK_SIZE]] for j in range(0, len(batch), CHUNK_SIZE)]
+        name = self.__class__.__name__
+        results = {}
+        remaining = len(chunks)
+        metrics.WORKERS_BUSY.set(min(self.max_workers, remaining), scanner=name)
+        for res in executor.map(_scan_chunk, chunks):
+            results.update(res)
+            remaining -= 1
+            metrics.WORKERS_BUSY.set(min(self.max_workers, remaining), scanner=name)
+        return results
+
+def benchmark(path: str, max_workers: int = 4):
+    """Compare in-process throughput against a plain `bandit -r` CLI run on the same tree"""
+    scanner = Bandit(max_workers=max_workers)
+    files = scanner.discover_files(path, scanner.get_file_extensions())
+
+    start = time.time()
+    scanner.scan_batch(files)
+    in_process = time.time() - start
+
+    start = time.time()
+    subprocess.run(['bandit', '-r', '-q', '-f', 'json', path], capture_output=True, text=True)
+    cli = time.time() - start
+
+    print(f"Files: {len(files)}")
+    print(f"In-process ({max_workers} workers): {in_process:.2f}s ({len(files) / in_process:.1f} files/s)")
+    print(f"bandit -r CLI: {cli:.2f}s ({len(files) / cli:.1f} files/s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the in-process bandit scanner against the CLI")
+    parser.add_argument("path", help="Path of the codebase to scan")
+    parser.add_argument("--workers", type=int, default=4, help="Pool workers for the in-process run")
+    args = parser.parse_args()
+    benchmark(args.path, args.workers)
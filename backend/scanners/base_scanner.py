@@ -1,13 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from pathlib import Path
 import json
 from concurrent.futures import ProcessPoolExecutor
 import os
+import subprocess
+from ignore import IgnoreMatcher
+import metrics
 
 class BaseScanner(ABC):
     """Base class for all code health scanners"""
-    
+    supports_sampling = True # scans files independently, so a sample of files gives representative results
+
     def __init__(self, max_workers: Optional[int] = None, exclude_patterns: Optional[List[str]] = None):
         self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4) # number of workers that will be scanning files for each scanner
         self.exclude_patterns = exclude_patterns or [
@@ -21,6 +25,22 @@ class BaseScanner(ABC):
             '.exe', '.dll', '.so', '.dylib'
         ] # file extensions to exclude
         self.results = []
+        self.journal = None # optional ScanJournal used to checkpoint finished chunks
+        self.content_index = None # optional ContentIndex shared by content scanners
+        self.candidate_offsets = {} # file path -> {literal -> byte offsets} from the content index
+        self.source_cache = None # optional SourceCache so Python analyzers share one parse per file
+        self.quarantine = None # optional per-repo Quarantine of files that time out on their own
+        self.state_dir = None # optional per-repo directory for state kept between scans
+        self.ignore_globs = [] # extra gitignore-style patterns on top of the repo's own ignore files
+
+    def __getstate__(self):
+        # Scanners are pickled into pool workers; parent-only state stays behind
+        state = self.__dict__.copy()
+        state['journal'] = None
+        state['content_index'] = None
+        state['candidate_offsets'] = {} # sent per file with each task instead
+        state['quarantine'] = None
+        return state
         
     def should_exclude(self, path: Path) -> bool:
         """Check if path should be excluded from scanning"""
@@ -35,19 +55,36 @@ class BaseScanner(ABC):
         return False
 
     def discover_files(self, root_path: str, extensions: List[str]) -> List[Path]:
-        """Discover files with specified extensions"""
-        root = Path(root_path)
+        """Discover files with specified extensions, honouring .gitignore, .codeiqignore and user globs"""
+        matcher = IgnoreMatcher.for_root(Path(root_path), self.ignore_globs)
+        suffixes = None if extensions == ['*'] or not extensions else tuple(f".{ext.lstrip('.')}" for ext in extensions)
+
         files = []
-        if extensions == ['*'] or not extensions:
-            return [p for p in root.rglob('*') if p.is_file() and not self.should_exclude(p)]
-        
-        for ext in extensions:
-            pattern = f"**/*.{ext.lstrip('.')}"
-            for file_path in root.glob(pattern):
-                if file_path.is_file() and not self.should_exclude(file_path):
-                    files.append(file_path)
-                    
-        return files
+        for dirpath, dirnames, filenames in os.walk(root_path):
+            rel_dir = os.path.relpath(dirpath, root_path).replace(os.sep, '/')
+            rel_dir = '' if rel_dir == '.' else rel_dir
+            if rel_dir and '.gitignore' in filenames:
+                matcher.add_file(Path(dirpath) / '.gitignore', base=rel_dir)
+
+            # Prune in place so ignored directories are never entered
+            dirnames[:] = [
+                d for d in dirnames
+                if d not in self.exclude_patterns and not matcher.match(f'{rel_dir}/{d}' if rel_dir else d, True)
+            ]
+
+            for name in filenames:
+                if suffixes is not None and not name.endswith(suffixes):
+                    continue
+                if name in self.exclude_patterns or os.path.splitext(name)[1].lower() in self.exclude_extensions:
+                    continue
+                if matcher.match(f'{rel_dir}/{name}' if rel_dir else name, False):
+                    continue
+                path = Path(dirpath, name)
+                if path.is_file():
+                    files.append(path)
+
+        # Sorted so chunk boundaries are stable between a scan and its resume
+        return sorted(files)
     
     @abstractmethod
     def scan_single_file(self, file_path: Path) -> Dict[str, Any]:
@@ -58,6 +95,20 @@ class BaseScanner(ABC):
     def get_file_extensions(self) -> List[str]:
         """Return file extensions this scanner handles"""
         pass
+
+    def get_required_literals(self) -> List[str]:
+        """Literals every finding of this scanner contains; files without any of them are skipped.
+        An empty list (the default) means every file must be scanned."""
+        return []
+
+    def clean_result(self) -> Dict[str, Any]:
+        """Result for a file the content index shows has nothing to find"""
+        return {'raw': [], 'errors': [], 'score': 100}
+
+    def scan_candidate(self, file_path: Path, offsets: Dict[str, List[int]]) -> Dict[str, Any]:
+        """Scan a file given the byte offsets of its required literals.
+        Scanners that can skip to those offsets override this; the default scans the whole file."""
+        return self.scan_single_file(file_path)
     
     def scan_batch(self, file_paths: List[Path], batch_size: int = 500) -> Dict[str, Any]:
         """Process files in batches to manage memory and system resources"""
@@ -65,9 +116,8 @@ class BaseScanner(ABC):
 
         with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
             for i in range(0, len(file_paths), batch_size):
-                batch = file_paths[i:i + batch_size]                
-                for res in list(executor.map(self._safe_scan, batch)):
-                    all_results.update(res)
+                batch = file_paths[i:i + batch_size]
+                all_results.update(self._checkpointed(batch, lambda chunk: self._map_chunk(executor, chunk)))
                     
                 # Brief pause between batches to prevent system overload
                 # if i + batch_size < len(file_paths):
@@ -75,8 +125,97 @@ class BaseScanner(ABC):
                 
         return all_results
     
-    def _safe_scan(self, path: Path):
+    def _map_chunk(self, executor, chunk: List[Path]) -> Dict[str, Any]:
+        name = self.__class__.__name__
+        results = {}
+        remaining = len(chunk)
+        metrics.WORKERS_BUSY.set(min(self.max_workers, remaining), scanner=name)
+        offsets = [self.candidate_offsets.get(str(p)) for p in chunk]
+        for res in executor.map(self._safe_scan, chunk, offsets):
+            results.update(res)
+            remaining -= 1
+            metrics.WORKERS_BUSY.set(min(self.max_workers, remaining), scanner=name)
+        return results
+
+    def _checkpointed(self, chunk: List[Path], scan_chunk: Callable[[List[Path]], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return journaled results for a chunk, or scan it and checkpoint the results"""
+        name = self.__class__.__name__
+        if self.journal is None:
+            results = scan_chunk(chunk)
+            self._finished(chunk)
+            return results
+
+        key = self.journal.chunk_key(chunk)
+        cached = self.journal.get_chunk(name, key)
+        metrics.CACHE_REQUESTS.inc(cache='journal', result='miss' if cached is None else 'hit')
+        if cached is not None:
+            self._finished(chunk)
+            return cached
+
+        results = scan_chunk(chunk)
+        # Chunks with transient failures (timeouts, tool crashes) are retried on resume rather than checkpointed;
+        # deterministic errors such as unparseable files would only fail the same way again
+        if not any(isinstance(res, dict) and res.get('transient') for res in results.values()):
+            self.journal.record_chunk(name, key, results)
+        self._finished(chunk)
+        return results
+
+    def _finished(self, chunk: List[Path]):
+        name = self.__class__.__name__
+        metrics.FILES_SCANNED.inc(len(chunk), scanner=name)
+        metrics.FILES_QUEUED.dec(len(chunk), scanner=name)
+
+    def _run_tool(self, tool: str, cmd: List[str], timeout: float) -> subprocess.CompletedProcess:
+        """Run an external tool, timing it and counting it as a busy worker while it runs"""
+        with metrics.SUBPROCESS_SECONDS.time(tool=tool), metrics.WORKERS_BUSY.track(scanner=self.__class__.__name__):
+            return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+
+    def _split_quarantined(self, file_paths: List[Path]) -> Tuple[List[Path], List[Path]]:
+        """Split files into (healthy, quarantined) so known-slow files never share a batch"""
+        if self.quarantine is None:
+            return file_paths, []
+        return self.quarantine.split(self.__class__.__name__, file_paths)
+
+    def _bisect_timeouts(self, paths: List[Path], run: Callable[[List[Path], float], Dict[str, Any]],
+                         timeout: float, min_timeout: float, label: str) -> Dict[str, Any]:
+        """Run a batch; when it times out, halve it (and its timeout) until the slow files are isolated.
+        Healthy halves finish normally and files that time out alone are quarantined."""
         try:
+            return run(paths, timeout)
+        except subprocess.TimeoutExpired:
+            pass
+
+        if len(paths) == 1:
+            reason = f'{label} timeout ({timeout:g}s)'
+            if self.quarantine is not None:
+                self.quarantine.add(self.__class__.__name__, paths[0], reason)
+            return {str(paths[0]): {'raw': [], 'errors': [reason], 'score': 0, 'transient': True}}
+
+        mid = len(paths) // 2
+        results = {}
+        for half in (paths[:mid], paths[mid:]):
+            results.update(self._bisect_timeouts(half, run, max(min_timeout, timeout / 2), min_timeout, label))
+        return results
+
+    def _scan_isolated(self, paths: List[Path], run: Callable[[List[Path], float], Dict[str, Any]],
+                       timeout: float, label: str) -> Dict[str, Any]:
+        """Scan quarantined files one at a time so each can only cost its own timeout.
+        Files that finish are released, so a file that was only slow on a loaded machine recovers."""
+        results = {}
+        for path in paths:
+            try:
+                results.update(run([path], timeout))
+            except subprocess.TimeoutExpired:
+                results[str(path)] = {'raw': [], 'errors': [f'{label} timeout ({timeout:g}s, quarantined)'], 'score': 0, 'transient': True}
+                continue
+            if self.quarantine is not None:
+                self.quarantine.remove(self.__class__.__name__, path)
+        return results
+
+    def _safe_scan(self, path: Path, offsets: Optional[Dict[str, List[int]]] = None):
+        try:
+            if offsets is not None:
+                return self.scan_candidate(path, offsets)
             return self.scan_single_file(path)
         except Exception as e:
             return {str(path): {'raw': [], 'errors':[str(e)]}, 'score': 0}
@@ -91,12 +230,30 @@ class BaseScanner(ABC):
         files = self.discover_files(path, extensions)
         
         print(f"Found {len(files)} files with extensions {extensions}")
+        metrics.FILES_DISCOVERED.inc(len(files), scanner=self.__class__.__name__)
         
         if not files:
             return {}
+
+        results = {}
+        literals = self.get_required_literals()
+        if self.content_index is not None and literals:
+            files, clean = self.content_index.filter(files, literals)
+            metrics.CACHE_REQUESTS.inc(len(clean), cache='content_index', result='hit')
+            metrics.CACHE_REQUESTS.inc(len(files), cache='content_index', result='miss')
+            if clean:
+                # Journaled like any other chunk so a resumed scan restores them with the rest
+                metrics.FILES_QUEUED.inc(len(clean), scanner=self.__class__.__name__)
+                results.update(self._checkpointed(clean, lambda chunk: {str(p): self.clean_result() for p in chunk}))
+            self.candidate_offsets = {
+                str(p): self.content_index.offsets(p, literals) for p in files if str(p) in self.content_index.hits
+            }
+            print(f"Content index skipped {len(clean)} files without {literals}")
         
         # Process files
-        results = self.scan_batch(files)
+        if files:
+            metrics.FILES_QUEUED.inc(len(files), scanner=self.__class__.__name__)
+            results.update(self.scan_batch(files))
         # self.write_results(results)
         return results
         
@@ -0,0 +1,54 @@
+from base_scanner import BaseScanner
+from source_cache import SourceCache
+from typing import Dict, Any, List
+from pathlib import Path
+from radon.complexity import cc_visit_ast, cc_rank, ComplexityVisitor
+from radon.metrics import h_visit_ast, mi_compute
+from radon.raw import analyze
+
+class Complexity(BaseScanner):
+    """Cyclomatic complexity and maintainability index via radon"""
+
+    def __init__(self, max_workers=None, exclude_patterns=None):
+        super().__init__(max_workers, exclude_patterns)
+
+    def get_file_extensions(self) -> List[str]:
+        return ['.py']
+
+    def scan_single_file(self, file_path: Path) -> Dict[str, Any]:
+        """Score a Python file by its maintainability index and report complex blocks"""
+        result = {
+            str(file_path): {
+                'raw': [],
+                'errors': [],
+                'score': 0
+            }
+        }
+
+        try:
+            # Reuse the scan-wide parse when running under the orchestrator
+            source, tree = (self.source_cache or SourceCache()).get(file_path)
+
+            for block in sorted(cc_visit_ast(tree), key=lambda b: (b.lineno, b.col_offset)):
+                rank = cc_rank(block.complexity)
+                if rank != 'A':
+                    result[str(file_path)]['raw'].append(
+                        f'{block.lineno}:{block.col_offset}: [{rank}]: {block.fullname} has cyclomatic complexity {block.complexity}'
+                    )
+
+            # Same inputs as radon's mi_visit, computed from the cached tree instead of a reparse
+            raw = analyze(source)
+            comments = (raw.comments + raw.multi) / float(raw.sloc) * 100 if raw.sloc else 0
+            mi = mi_compute(
+                h_visit_ast(tree).total.volume,
+                ComplexityVisitor.from_ast(tree).total_complexity,
+                raw.lloc,
+                comments
+            )
+            result[str(file_path)]['score'] = round(mi, 2)
+        except SyntaxError as e:
+            result[str(file_path)]['errors'].append(f'Parse error: {str(e)}')
+        except Exception as e:
+            result[str(file_path)]['errors'].append(f'Complexity error: {str(e)}')
+
+        return result
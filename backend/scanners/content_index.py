@@ -0,0 +1,74 @@
+from typing import Dict, List, Optional, Tuple, Iterable
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import re
+import os
+
+def _sweep_file(path: Path, pattern: 're.Pattern[bytes]') -> Optional[Dict[str, List[int]]]:
+    """Find every occurrence of the indexed literals in one file (runs in a pool worker)"""
+    try:
+        with open(path, 'rb') as f:
+            content = f.read()
+    except OSError:
+        return None
+
+    hits = {}
+    for match in pattern.finditer(content):
+        literal = match.group().lower().decode('utf-8', 'replace')
+        hits.setdefault(literal, []).append(match.start())
+    return hits
+
+class ContentIndex:
+    """Per-scan literal index built with a single sweep over the repository.
+
+    Content scanners declare the literals their findings require (e.g. ``TODO``) and only
+    receive the files containing at least one of them. Matching is case-insensitive, so the
+    candidate set is always a superset of what a case-sensitive rule would need.
+    """
+
+    def __init__(self, literals: Iterable[str]):
+        self.literals = sorted({literal.lower() for literal in literals if literal})
+        self.hits = {} # file path -> {literal -> byte offsets}
+        self.indexed = set() # every file path the sweep read successfully
+
+    @classmethod
+    def build(cls, files: List[Path], literals: Iterable[str], max_workers: Optional[int] = None) -> 'ContentIndex':
+        index = cls(literals)
+        if not index.literals or not files:
+            return index
+
+        # One alternation of every literal, so each file is read and swept exactly once
+        pattern = re.compile(b'|'.join(re.escape(literal.encode('utf-8')) for literal in index.literals), re.IGNORECASE)
+        sweep = partial(_sweep_file, pattern=pattern)
+        workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for path, hits in zip(files, executor.map(sweep, files, chunksize=64)):
+                if hits is None:
+                    continue # unreadable files stay candidates so scanners can report the error
+                index.indexed.add(str(path))
+                if hits:
+                    index.hits[str(path)] = hits
+
+        print(f"Indexed {len(index.indexed)} files for literals {index.literals}: {len(index.hits)} contain at least one")
+        return index
+
+    def offsets(self, path: Path, literals: Iterable[str]) -> Dict[str, List[int]]:
+        """Byte offsets of the given literals in a file"""
+        hits = self.hits.get(str(path), {})
+        return {literal.lower(): hits[literal.lower()] for literal in literals if literal.lower() in hits}
+
+    def filter(self, files: List[Path], literals: Iterable[str]) -> Tuple[List[Path], List[Path]]:
+        """Split files into (candidates, files known to contain none of the literals)"""
+        wanted = [literal.lower() for literal in literals]
+        if any(literal not in self.literals for literal in wanted):
+            return files, [] # the index can't answer for literals it wasn't built with
+
+        candidates, clean = [], []
+        for path in files:
+            key = str(path)
+            if key not in self.indexed or any(literal in self.hits.get(key, {}) for literal in wanted):
+                candidates.append(path)
+            else:
+                clean.append(path)
+        return candidates, clean
@@ -0,0 +1,143 @@
+from base_scanner import BaseScanner
+from advisory_db import AdvisoryDatabase
+from typing import Dict, Any, List, Iterator, Optional, Tuple
+from pathlib import Path
+import os
+import re
+
+SEVERITY_WEIGHTS = {'CRITICAL': 15, 'HIGH': 10, 'MEDIUM': 5, 'LOW': 1}
+
+# Keys inside lockfiles whose objects are metadata rather than packages
+LOCK_STRUCTURAL_KEYS = {
+    'packages', 'dependencies', 'devDependencies', 'optionalDependencies', 'peerDependencies',
+    'peerDependenciesMeta', 'requires', 'engines', 'bin', 'funding', 'bundleDependencies',
+    'bundledDependencies', 'overrides', 'scripts', 'repository', 'workspaces', 'directories'
+}
+MANIFEST_SECTIONS = ('dependencies', 'devDependencies', 'optionalDependencies', 'peerDependencies')
+
+_REQUIREMENT = re.compile(r'^([A-Za-z0-9][A-Za-z0-9._-]*)(?:\[[^\]]*\])?\s*===?\s*([^\s;,]+)')
+_JSON_OBJECT_KEY = re.compile(r'^\s*"([^"]*)"\s*:\s*\{\s*$')
+_JSON_STRING_PAIR = re.compile(r'^\s*"([^"]+)"\s*:\s*"([^"]*)"')
+_NPM_EXACT = re.compile(r'^=?v?(\d+\.\d+\.\d+(?:-[0-9A-Za-z.-]+)?(?:\+[0-9A-Za-z.-]+)?)$')
+
+# One read-only database handle per pool worker
+_databases = {}
+
+def _database(path: str) -> AdvisoryDatabase:
+    if path not in _databases:
+        _databases[path] = AdvisoryDatabase(path)
+    return _databases[path]
+
+def manifest_kind(path: Path) -> Optional[str]:
+    name = path.name
+    if name == 'package-lock.json':
+        return 'npm-lock'
+    if name == 'package.json':
+        return 'npm-manifest'
+    if name.startswith('requirements') and name.endswith('.txt'):
+        return 'requirements'
+    return None
+
+def parse_requirements(lines: Iterator[str]) -> Iterator[Tuple[int, str, str, str]]:
+    """Exact pins from a requirements file; ranges have no single version to check"""
+    for line_num, line in enumerate(lines, start=1):
+        line = line.split(' #', 1)[0].strip()
+        if not line or line.startswith(('#', '-')):
+            continue
+        if match := _REQUIREMENT.match(line):
+            yield line_num, 'pypi', match.group(1), match.group(2)
+
+def parse_package_json(lines: Iterator[str]) -> Iterator[Tuple[int, str, str, str]]:
+    """Exact pins from the dependency sections of package.json. Ranges are left to the lockfile:
+    the lowest version a range allows is rarely what gets installed."""
+    section = None
+    for line_num, line in enumerate(lines, start=1):
+        if section is None:
+            match = _JSON_OBJECT_KEY.match(line)
+            if match and match.group(1) in MANIFEST_SECTIONS:
+                section = match.group(1)
+            continue
+        if line.strip().startswith('}'):
+            section = None
+            continue
+        if match := _JSON_STRING_PAIR.match(line):
+            exact = _NPM_EXACT.match(match.group(2).strip())
+            if exact:
+                yield line_num, 'npm', match.group(1), exact.group(1)
+
+def parse_package_lock(lines: Iterator[str]) -> Iterator[Tuple[int, str, str, str]]:
+    """Stream installed versions out of package-lock.json (v1-v3) without loading the whole file.
+    Each name@version is yielded once: v2 lockfiles list every package in both `packages` and the legacy `dependencies` tree."""
+    pending = None
+    seen = set()
+    for line_num, line in enumerate(lines, start=1):
+        match = _JSON_OBJECT_KEY.match(line)
+        if match:
+            key = match.group(1)
+            name = key.rsplit('node_modules/', 1)[-1]
+            pending = name if name and key not in LOCK_STRUCTURAL_KEYS else None
+            continue
+        if pending:
+            pair = _JSON_STRING_PAIR.match(line)
+            if pair and pair.group(1) == 'version':
+                if (pending, pair.group(2)) not in seen:
+                    seen.add((pending, pair.group(2)))
+                    yield line_num, 'npm', pending, pair.group(2)
+                pending = None
+
+PARSERS = {
+    'requirements': parse_requirements,
+    'npm-manifest': parse_package_json,
+    'npm-lock': parse_package_lock,
+}
+
+class Dependencies(BaseScanner):
+    """Known-vulnerable dependencies in manifests and lockfiles, checked against an offline advisory database"""
+    supports_sampling = False # manifests are too few to sample
+
+    def __init__(self, max_workers=None, exclude_patterns=None, db_path=None):
+        super().__init__(max_workers, exclude_patterns)
+        self.db_path = db_path or os.getenv("ADVISORY_DB_PATH", "./data/advisories.sqlite")
+
+    def get_file_extensions(self) -> List[str]:
+        return ['.txt', '.json']
+
+    def discover_files(self, root_path: str, extensions: List[str]) -> List[Path]:
+        files = [p for p in super().discover_files(root_path, extensions) if manifest_kind(p)]
+        locked = {p.parent for p in files if manifest_kind(p) == 'npm-lock'}
+        # A lockfile already lists every installed version, pins included; checking both reports twice
+        return [p for p in files if not (manifest_kind(p) == 'npm-manifest' and p.parent in locked)]
+
+    def scan(self, path: str):
+        if not os.path.exists(self.db_path):
+            print(f"Warning: advisory database not found at {self.db_path}; compile one with advisory_db.py")
+            return {}
+        return super().scan(path)
+
+    def scan_single_file(self, file_path: Path) -> Dict[str, Any]:
+        """Look up every pinned package in a manifest or lockfile"""
+        result = {
+            str(file_path): {
+                'raw': [],
+                'errors': [],
+                'score': 0
+            }
+        }
+
+        try:
+            database = _database(self.db_path)
+            parse = PARSERS[manifest_kind(file_path)]
+            penalty = 0
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                for line_num, ecosystem, package, version in parse(f):
+                    for advisory in database.lookup(ecosystem, package, version):
+                        result[str(file_path)]['raw'].append(
+                            f"{line_num}:0: [{advisory['id']}:{advisory['severity']}]: {package} {version} - {advisory['summary']}"
+                        )
+                        penalty += SEVERITY_WEIGHTS.get(advisory['severity'], 5)
+
+            result[str(file_path)]['score'] = max(0, 100 - penalty)
+        except Exception as e:
+            result[str(file_path)]['errors'].append(f'Dependency scan error: {str(e)}')
+
+        return result
@@ -0,0 +1,91 @@
+from typing import Dict, Any, List, Optional, Tuple
+from pathlib import Path
+from collections import defaultdict
+import math
+import random
+
+Z_95 = 1.96
+
+def stratum_key(rel_path: str) -> Tuple[str, str]:
+    """Strata are (top-level directory, extension): files within one tend to score alike"""
+    parts = Path(rel_path).parts
+    top = parts[0] if len(parts) > 1 else '.'
+    return top, Path(rel_path).suffix.lower()
+
+MIN_PER_STRATUM = 2 # smallest per-stratum sample that still has a variance
+OTHER_STRATUM = ('other', '')
+
+def stratify(rel_paths: List[str], max_strata: Optional[int] = None) -> Dict[Tuple[str, str], List[str]]:
+    """Group files into strata, merging the smallest into one 'other' stratum beyond max_strata"""
+    strata = defaultdict(list)
+    for rel in rel_paths:
+        strata[stratum_key(rel)].append(rel)
+
+    if max_strata is None or len(strata) <= max_strata:
+        return dict(strata)
+    ranked = sorted(strata, key=lambda key: len(strata[key]), reverse=True)
+    merged = {key: strata[key] for key in ranked[:max(0, max_strata - 1)]}
+    merged[OTHER_STRATUM] = [rel for key in ranked[max(0, max_strata - 1):] for rel in strata[key]]
+    return merged
+
+def stratified_sample(strata: Dict[Tuple[str, str], List[str]], sample_size: int, seed: Optional[int] = None) -> Dict[Tuple[str, str], List[str]]:
+    """A floor of MIN_PER_STRATUM files per stratum, the rest of sample_size allocated proportionally.
+    Stays within sample_size as long as there are at most sample_size / MIN_PER_STRATUM strata."""
+    rng = random.Random(seed)
+    total = sum(len(members) for members in strata.values())
+    if not total:
+        return {}
+
+    counts = {key: min(MIN_PER_STRATUM, len(members)) for key, members in strata.items()}
+    spare = max(0, sample_size - sum(counts.values()))
+    # Largest-remainder rounding so the allocations add up to exactly the spare budget
+    shares = {key: spare * len(members) / total for key, members in strata.items()}
+    for key, share in shares.items():
+        counts[key] += int(share)
+    leftover = spare - sum(int(share) for share in shares.values())
+    for key in sorted(shares, key=lambda key: shares[key] - int(shares[key]), reverse=True)[:leftover]:
+        counts[key] += 1
+
+    return {key: rng.sample(members, min(counts[key], len(members))) for key, members in strata.items()}
+
+def stratified_mean(strata_sizes: Dict[Tuple[str, str], int], values: Dict[Tuple[str, str], List[float]]) -> Optional[Dict[str, Any]]:
+    """Stratified estimate of the population mean with a 95% confidence interval.
+
+    Strata without any sampled value are left out and the remaining weights renormalized.
+    Strata with a single value borrow the variance pooled across the others, since their own is unknown.
+    """
+    observed = {key: vals for key, vals in values.items() if vals}
+    population = sum(strata_sizes[key] for key in observed)
+    if sum(len(vals) for vals in observed.values()) < 2:
+        return None # one value can't say anything about spread
+
+    means = {key: sum(vals) / len(vals) for key, vals in observed.items()}
+    variances = {
+        key: sum((v - means[key]) ** 2 for v in vals) / (len(vals) - 1)
+        for key, vals in observed.items() if len(vals) > 1
+    }
+    degrees = sum(len(observed[key]) - 1 for key in variances)
+    if degrees:
+        pooled = sum((len(observed[key]) - 1) * variances[key] for key in variances) / degrees
+    else:
+        # Every stratum has one value: fall back to the spread across all of them
+        every = [v for vals in observed.values() for v in vals]
+        average = sum(every) / len(every)
+        pooled = sum((v - average) ** 2 for v in every) / (len(every) - 1)
+
+    mean, variance = 0.0, 0.0
+    for key, vals in observed.items():
+        size, n = strata_sizes[key], len(vals)
+        weight = size / population
+        mean += weight * means[key]
+        # Finite population correction: a fully sampled stratum contributes no uncertainty
+        variance += weight ** 2 * (1 - n / size) * variances.get(key, pooled) / n
+
+    margin = Z_95 * math.sqrt(variance)
+    return {
+        'mean': mean,
+        'low': mean - margin,
+        'high': mean + margin,
+        'sampled': sum(len(vals) for vals in observed.values()),
+        'exact': False
+    }
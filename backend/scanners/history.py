@@ -0,0 +1,195 @@
+from base_scanner import BaseScanner
+from typing import Dict, Any, Optional
+from pathlib import Path
+import json
+import os
+import subprocess
+import time
+import metrics
+
+COMMIT_MARKER = '\x1e'
+FIELD_SEPARATOR = '\x1f'
+SECONDS_PER_DAY = 86400
+CACHE_VERSION = 2 # bumped when cached paths change form (2: unquoted paths from -z)
+
+def _records(stream, size: int = 1 << 16):
+    """NUL-separated records from a `git log -z` stream, read in blocks"""
+    pending = ''
+    for block in iter(lambda: stream.read(size), ''):
+        parts = (pending + block).split('\0')
+        pending = parts.pop()
+        yield from parts
+    if pending:
+        yield pending
+
+class History(BaseScanner):
+    """Ownership, churn, staleness and bus factor from a single streamed `git log --numstat` pass"""
+    supports_sampling = False # one repo-wide git log pass
+
+    def __init__(self, max_workers=None, exclude_patterns=None, since_days: Optional[int] = None, max_commits: Optional[int] = None):
+        super().__init__(max_workers, exclude_patterns)
+        self.since_days = since_days # only walk history this many days back
+        self.max_commits = max_commits # only walk this many commits back from HEAD
+
+    def get_file_extensions(self):
+        return ["*"]
+
+    def scan_single_file(self, file_path: Path) -> Dict[str, Any]:
+        """History is collected repo-wide in one pass; see scan()"""
+        return {}
+
+    def scan(self, path: str):
+        files = self.discover_files(path, self.get_file_extensions())
+        print(f"Found {len(files)} files with extensions {self.get_file_extensions()}")
+        metrics.FILES_DISCOVERED.inc(len(files), scanner=self.__class__.__name__)
+        if not files:
+            return {}
+
+        try:
+            toplevel = Path(self._git(path, 'rev-parse', '--show-toplevel')).resolve()
+            head = self._git(path, 'rev-parse', 'HEAD')
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            print(f"Warning: {path} is not a git checkout, skipping history: {e}")
+            return {}
+
+        stats = self._history(path, head)
+        now = time.time()
+
+        results = {}
+        for file_path in files:
+            try:
+                rel = str(file_path.resolve().relative_to(toplevel))
+            except ValueError:
+                continue
+            file_stats = stats.get(rel)
+            if file_stats:
+                results[str(file_path)] = self._score(file_stats, now)
+        metrics.FILES_SCANNED.inc(len(files), scanner=self.__class__.__name__)
+        return results
+
+    def _git(self, path: str, *args: str) -> str:
+        return subprocess.run(['git', '-C', path, *args], capture_output=True, text=True, check=True).stdout.strip()
+
+    def _limits(self) -> Dict[str, Any]:
+        return {'since_days': self.since_days, 'max_commits': self.max_commits}
+
+    def _history(self, path: str, head: str) -> Dict[str, Dict[str, Any]]:
+        """Per-file stats for HEAD, reusing the per-repo cache and only walking commits it hasn't seen"""
+        cache_path = os.path.join(self.state_dir, 'history.json') if self.state_dir else None
+        cache = None
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r') as f:
+                    cache = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                cache = None
+
+        if cache and cache.get('version') == CACHE_VERSION and cache.get('limits') == self._limits():
+            if cache.get('head') == head:
+                print(f"History cache hit at {head[:12]}")
+                metrics.CACHE_REQUESTS.inc(cache='history', result='hit')
+                return cache['files']
+
+            # Windowed history can't be extended incrementally: old commits would never fall out
+            unbounded = self.since_days is None and self.max_commits is None
+            if unbounded and self._is_ancestor(path, cache.get('head'), head):
+                print(f"History cache at {cache['head'][:12]}, walking new commits up to {head[:12]}")
+                metrics.CACHE_REQUESTS.inc(cache='history', result='partial')
+                files = self._walk(path, f"{cache['head']}..{head}", cache['files'])
+                self._save(cache_path, head, files)
+                return files
+
+        metrics.CACHE_REQUESTS.inc(cache='history', result='miss')
+        files = self._walk(path, head, {})
+        if cache_path:
+            self._save(cache_path, head, files)
+        return files
+
+    def _is_ancestor(self, path: str, ancestor: Optional[str], head: str) -> bool:
+        if not ancestor:
+            return False
+        return subprocess.run(['git', '-C', path, 'merge-base', '--is-ancestor', ancestor, head], capture_output=True).returncode == 0
+
+    def _save(self, cache_path: str, head: str, files: Dict[str, Dict[str, Any]]):
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp = f"{cache_path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'head': head, 'limits': self._limits(), 'files': files}, f)
+        os.replace(tmp, cache_path)
+
+    def _walk(self, path: str, revisions: str, files: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Stream `git log --numstat` once and fold every commit into the per-file stats.
+        -z keeps paths unquoted, so non-ASCII names and names with tabs or newlines match as-is."""
+        cmd = [
+            'git', '-C', path, 'log', '--numstat', '--no-renames', '--no-merges', '-z',
+            f'--format={COMMIT_MARKER}%H{FIELD_SEPARATOR}%at{FIELD_SEPARATOR}%aE'
+        ]
+        if self.since_days is not None:
+            cmd.append(f'--since={self.since_days}.days.ago')
+        if self.max_commits is not None:
+            cmd.append(f'--max-count={self.max_commits}')
+        cmd.append(revisions)
+
+        author, timestamp = None, 0
+        with metrics.SUBPROCESS_SECONDS.time(tool='git-log'), \
+                subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, encoding='utf-8', errors='replace') as proc:
+            for line in _records(proc.stdout):
+                # The first numstat record after each commit header starts with the header's newline
+                if line.startswith('\n'):
+                    line = line[1:]
+                if line.startswith(COMMIT_MARKER):
+                    _, at, author = line[1:].split(FIELD_SEPARATOR, 2)
+                    timestamp = int(at)
+                    continue
+
+                parts = line.split('\t', 2)
+                if len(parts) != 3 or author is None:
+                    continue
+                added, deleted, rel = parts
+                # Binary files report '-' for both counts
+                lines = (int(added) if added.isdigit() else 0) + (int(deleted) if deleted.isdigit() else 0)
+
+                entry = files.setdefault(rel, {'churn': 0, 'commits': 0, 'authors': {}, 'last_touch': 0})
+                entry['churn'] += lines
+                entry['commits'] += 1
+                entry['authors'][author] = entry['authors'].get(author, 0) + lines
+                entry['last_touch'] = max(entry['last_touch'], timestamp)
+
+        return files
+
+    def _score(self, stats: Dict[str, Any], now: float) -> Dict[str, Any]:
+        authors = stats['authors']
+        churn = stats['churn']
+        age_days = int((now - stats['last_touch']) / SECONDS_PER_DAY)
+
+        # Fewest authors who together wrote more than half of the changed lines
+        bus_factor, covered = 0, 0
+        for lines in sorted(authors.values(), reverse=True):
+            bus_factor += 1
+            covered += lines
+            if churn == 0 or covered * 2 > churn:
+                break
+
+        raw = []
+        score = 100
+        if bus_factor == 1:
+            owner = max(authors, key=authors.get)
+            if len(authors) == 1:
+                raw.append(f'0:0: OWNERSHIP: Bus factor 1 - {owner} is the only author')
+                score -= 30
+            else:
+                raw.append(f'0:0: OWNERSHIP: Bus factor 1 - {owner} wrote most of the changes ({len(authors)} authors)')
+                score -= 20
+        # Whole years or half a year rather than days, so results stay identical between scans
+        if age_days > 365:
+            years = age_days // 365
+            raw.append(f'0:0: STALE: Last touched over {years} year{"s" if years > 1 else ""} ago')
+            score -= 20
+        elif age_days > 180:
+            raw.append('0:0: STALE: Last touched over 6 months ago')
+            score -= 10
+        if churn > 1000:
+            raw.append(f'0:0: CHURN: {churn} lines changed across {stats["commits"]} commits')
+            score -= min(20, churn // 1000 * 5)
+
+        return {'raw': raw, 'errors': [], 'score': max(0, score)}
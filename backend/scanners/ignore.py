@@ -0,0 +1,209 @@
+from typing import List, Optional, Iterable, Tuple
+from pathlib import Path
+import re
+
+def translate_glob(pattern: str) -> str:
+    """Translate a gitignore glob into a regex over '/'-separated relative paths"""
+    i, n, out = 0, len(pattern), []
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern[i:i + 2] == '**' and (i == 0 or pattern[i - 1] == '/'):
+                if pattern[i + 2:i + 3] == '/':
+                    out.append('(?:.*/)?') # '**/' matches any number of leading directories
+                    i += 3
+                    continue
+                if i + 2 == n:
+                    out.append('.*') # trailing '/**' matches everything inside
+                    i += 2
+                    continue
+            while i < n and pattern[i] == '*':
+                i += 1
+            out.append('[^/]*')
+            continue
+        if c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            start = i + 2 if pattern[i + 1:i + 2] in ('!', '^') else i + 1
+            end = pattern.find(']', start + 1) # a ']' right after the opening bracket is literal
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end].replace('\\', '\\\\')
+                if body[:1] in ('!', '^'):
+                    body = '^' + body[1:]
+                out.append(f'[{body}]')
+                i = end
+        elif c == '\\' and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 1
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+_GLOB_CHARS = re.compile(r'[*?\[\\]')
+
+class Rule:
+    """One parsed ignore line"""
+    __slots__ = ('regex', 'negated', 'directory_only', 'prefix', 'basename', 'literal', 'suffix')
+
+    def __init__(self, regex: str, negated: bool, directory_only: bool, prefix: str,
+                 basename: Optional[str], literal: Optional[str], suffix: Optional[str]):
+        self.regex = regex # matches the full relative path
+        self.negated = negated
+        self.directory_only = directory_only
+        self.prefix = prefix # literal text every matching path starts with
+        self.basename = basename # regex for the last path component, when that alone decides the match
+        self.literal = literal # exact last path component, when the pattern has no glob characters
+        self.suffix = suffix # required ending of the last component, for plain '*.ext' patterns
+
+def parse_rule(line: str, base: str = '') -> Optional[Rule]:
+    """Parse one ignore line, or return None for blanks and comments"""
+    if line.endswith('\n'):
+        line = line[:-1]
+    if not line.endswith('\\ '):
+        line = line.rstrip()
+    if not line or line.startswith('#'):
+        return None
+
+    negated = line.startswith('!')
+    if negated:
+        line = line[1:]
+    elif line.startswith(('\\!', '\\#')):
+        line = line[1:]
+
+    directory_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+
+    # A slash anywhere but the end anchors the pattern to the ignore file's directory
+    anchored = '/' in line
+    body = translate_glob(line.lstrip('/'))
+    base = base.strip('/')
+    prefix = re.escape(base + '/') if base else ''
+    regex = prefix + (body if anchored else '(?:.*/)?' + body)
+
+    if anchored:
+        glob = _GLOB_CHARS.search(line.lstrip('/'))
+        literal_head = line.lstrip('/')[:glob.start()] if glob else line.lstrip('/')
+        prefix = (base + '/' if base else '') + literal_head
+    else:
+        prefix = base + '/' if base else ''
+
+    # Unanchored root-level patterns only ever look at the last component, which is far cheaper to test
+    basename = body if not anchored and not base else None
+    literal = suffix = None
+    if basename is not None and not _GLOB_CHARS.search(line):
+        literal = line
+    elif basename is not None and line.startswith('*') and not _GLOB_CHARS.search(line[1:]):
+        suffix = line[1:]
+    return Rule(regex, negated, directory_only, prefix, basename, literal, suffix)
+
+class _CompiledRules:
+    """Rules split by how they can be tested, each part answering 'index of the last rule that matches'"""
+
+    def __init__(self, rules: List[Rule]):
+        self.negations = tuple(rule.negated for rule in rules)
+        self.any_negated = any(self.negations)
+        self.literals = {} # basename -> index of the last rule naming it
+        suffix_rules, basename_rules, path_rules = [], [], []
+        for index, rule in enumerate(rules):
+            if rule.literal is not None:
+                self.literals[rule.literal] = index
+            elif rule.suffix is not None:
+                suffix_rules.append((index, rule.suffix))
+            elif rule.basename is not None:
+                basename_rules.append((index, rule.basename))
+            else:
+                path_rules.append((index, rule.regex))
+        self.suffix_rules = suffix_rules[::-1]
+        self.suffixes = tuple(suffix for _, suffix in suffix_rules)
+        self.basename_pattern, self.basename_indexes = self._alternation(basename_rules)
+        self.path_pattern, self.path_indexes = self._alternation(path_rules)
+        # When every path rule starts with literal text, most paths are rejected by one startswith
+        prefixes = tuple(rules[index].prefix for index, _ in path_rules)
+        self.path_prefixes = prefixes if all(prefixes) else None
+
+    @staticmethod
+    def _alternation(indexed: List[Tuple[int, str]]):
+        if not indexed:
+            return None, ()
+        # Reversed so the first alternative to match is the last rule in file order
+        indexed = indexed[::-1]
+        pattern = re.compile('|'.join(f'({regex})' for _, regex in indexed))
+        return pattern, tuple(index for index, _ in indexed)
+
+    def ignored(self, rel_path: str) -> bool:
+        name = rel_path[rel_path.rfind('/') + 1:]
+        if not self.any_negated:
+            # Without negations any matching rule decides, so stop at the cheapest hit
+            return (
+                name in self.literals
+                or (self.suffixes and name.endswith(self.suffixes))
+                or (self.basename_pattern is not None and self.basename_pattern.fullmatch(name) is not None)
+                or (self.path_pattern is not None
+                    and (self.path_prefixes is None or rel_path.startswith(self.path_prefixes))
+                    and self.path_pattern.fullmatch(rel_path) is not None)
+            )
+
+        best = self.literals.get(name, -1)
+        if self.suffixes and name.endswith(self.suffixes):
+            best = max(best, next(index for index, suffix in self.suffix_rules if name.endswith(suffix)))
+        if self.basename_pattern is not None:
+            m = self.basename_pattern.fullmatch(name)
+            if m:
+                best = max(best, self.basename_indexes[m.lastindex - 1])
+        if self.path_pattern is not None and (self.path_prefixes is None or rel_path.startswith(self.path_prefixes)):
+            m = self.path_pattern.fullmatch(rel_path)
+            if m:
+                best = max(best, self.path_indexes[m.lastindex - 1])
+        return best >= 0 and not self.negations[best]
+
+class IgnoreMatcher:
+    """Every ignore rule for a scan (.gitignore files, .codeiqignore and user globs) compiled into
+    one matcher per path kind. Later rules win, as in git, and user rules always come last."""
+
+    def __init__(self):
+        self.repo_rules = [] # .gitignore rules in the order the walk finds them
+        self.override_rules = [] # .codeiqignore and user globs
+        self._compiled = None
+
+    @classmethod
+    def for_root(cls, root: Path, globs: Optional[Iterable[str]] = None) -> 'IgnoreMatcher':
+        matcher = cls()
+        matcher.add_file(Path(root) / '.gitignore')
+        matcher.add_file(Path(root) / '.codeiqignore', override=True)
+        matcher.add_patterns(globs or [], override=True)
+        return matcher
+
+    def add_file(self, path: Path, base: str = '', override: bool = False):
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                self.add_patterns(f, base, override)
+        except OSError:
+            pass
+
+    def add_patterns(self, lines: Iterable[str], base: str = '', override: bool = False):
+        rules = [rule for rule in (parse_rule(line, base) for line in lines) if rule]
+        if rules:
+            (self.override_rules if override else self.repo_rules).extend(rules)
+            self._compiled = None
+
+    def match(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Whether a path (relative to the root, '/'-separated) is ignored by the rules themselves.
+        Parent directories are not checked; walkers prune those before reaching their contents."""
+        if self._compiled is None:
+            rules = self.repo_rules + self.override_rules
+            # Files skip directory-only rules
+            self._compiled = (_CompiledRules([r for r in rules if not r.directory_only]), _CompiledRules(rules))
+        return bool(self._compiled[1 if is_dir else 0].ignored(rel_path))
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Full check for a single path, including whether any parent directory is ignored"""
+        parts = rel_path.split('/')
+        for depth in range(1, len(parts)):
+            if self.match('/'.join(parts[:depth]), True):
+                return True
+        return self.match(rel_path, is_dir)
@@ -0,0 +1,125 @@
+from typing import Dict, Any, List, Optional
+from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+
+class ScanJournal:
+    """Append-only local journal of completed scan work, used to resume interrupted scans.
+
+    Chunk keys and results are stored relative to the scan root and rebased onto the root
+    being scanned, so a scan can resume on a fresh clone of the same commit.
+    """
+
+    def __init__(self, scan_id: str, journal_dir: Optional[str] = None, resume: bool = False):
+        self.scan_id = scan_id
+        self.journal_dir = journal_dir or os.getenv("SCAN_JOURNAL_DIR", "./out/journal")
+        self.path = os.path.join(self.journal_dir, f"{scan_id}.jsonl")
+        self.scan_path = None
+        self.root = None # root the current process is scanning
+        self.chunks = {} # scanner name -> {chunk key -> results}
+        self.completed = set() # scanners that finished every chunk
+        self.mutex = threading.Lock()
+
+        os.makedirs(self.journal_dir, exist_ok=True)
+        if resume:
+            self._load()
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+
+    def set_root(self, path: str):
+        """Root the journaled paths are rebased onto; may differ from the recorded scan path on resume"""
+        self.root = path
+
+    def _relative(self, file_path: str) -> str:
+        if self.root is None:
+            return str(file_path)
+        rel = os.path.relpath(os.path.abspath(file_path), os.path.abspath(self.root))
+        return str(file_path) if rel.startswith('..') else rel
+
+    def _rebase(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        if self.root is None:
+            return results
+        return {str(Path(self.root, rel)): res for rel, res in results.items()}
+
+    def chunk_key(self, file_paths: List[Path]) -> str:
+        """Stable key for a chunk of files, independent of where the chunk sits in the scan
+        and of where the repo is checked out"""
+        digest = hashlib.sha1()
+        for path in file_paths:
+            digest.update(self._relative(path).encode('utf-8', 'surrogateescape'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            print(f"Warning: no journal found for scan {self.scan_id}, starting from scratch")
+            return
+
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # The process died mid-write; everything before this line is intact
+                    break
+
+                kind = entry.get('type')
+                if kind == 'meta':
+                    self.scan_path = entry.get('path')
+                elif kind == 'chunk':
+                    self.chunks.setdefault(entry['scanner'], {})[entry['key']] = entry['results']
+                elif kind == 'scanner':
+                    self.completed.add(entry['scanner'])
+
+        done = sum(len(chunks) for chunks in self.chunks.values())
+        print(f"Resuming scan {self.scan_id}: {done} chunks and {len(self.completed)} scanners already done")
+
+    def _append(self, entry: Dict[str, Any]):
+        with self.mutex:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry, default=str) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record_scan_path(self, path: str):
+        self.scan_path = path
+        self._append({'type': 'meta', 'path': path})
+
+    def get_chunk(self, scanner: str, key: str) -> Optional[Dict[str, Any]]:
+        results = self.chunks.get(scanner, {}).get(key)
+        return self._rebase(results) if results is not None else None
+
+    def record_chunk(self, scanner: str, key: str, results: Dict[str, Any]):
+        results = {self._relative(path): res for path, res in results.items()}
+        with self.mutex:
+            self.chunks.setdefault(scanner, {})[key] = results
+        self._append({'type': 'chunk', 'scanner': scanner, 'key': key, 'results': results})
+
+    def is_complete(self, scanner: str) -> bool:
+        return scanner in self.completed
+
+    def mark_complete(self, scanner: str, results: Optional[Dict[str, Any]] = None):
+        """Mark a scanner finished, storing whatever results its checkpointed chunks don't already hold:
+        everything for scanners that don't checkpoint, otherwise chunks skipped for errors."""
+        if results is not None:
+            journaled = set()
+            for chunk in self.chunks.get(scanner, {}).values():
+                journaled.update(chunk)
+            remainder = {path: res for path, res in results.items() if self._relative(path) not in journaled}
+            if remainder:
+                self.record_chunk(scanner, 'remainder', remainder)
+        self.completed.add(scanner)
+        self._append({'type': 'scanner', 'scanner': scanner})
+
+    def scanner_results(self, scanner: str) -> Dict[str, Any]:
+        results = {}
+        for chunk in self.chunks.get(scanner, {}).values():
+            results.update(chunk)
+        return self._rebase(results)
+
+    def discard(self):
+        """Remove the journal once the scan has been fully published"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -9,6 +9,9 @@ class Linter(BaseScanner):
     COMMANDS = {
         '.py': ['flake8', '--format=%(path)s:%(row)d:%(col)d: [%(code)s]: %(text)s']
     }
+    BATCH_TIMEOUT = 60 # seconds for one flake8 call over a whole chunk, or over one quarantined file
+    FILE_TIMEOUT = 5 # floor when bisecting
+
     def __init__(self, max_workers=None, exclude_patterns=None):
         super().__init__(max_workers, exclude_patterns)
 
@@ -59,51 +62,60 @@ class Linter(BaseScanner):
         if not file_paths:
             return {}
         
+        file_paths, quarantined = self._split_quarantined(file_paths)
         results = {}
         for i in range(0, len(file_paths), batch_size):
             batch = file_paths[i:i + batch_size]
+            results.update(self._checkpointed(batch, self._lint_chunk))
 
-            groups = defaultdict(list)
-            for path in batch:
-                groups[path.suffix].append(path)
-
-            for suffix, paths in groups.items():
-                cmd_base = self.COMMANDS.get(suffix)
-                if not cmd_base:
-                    continue
-                cmd = [*cmd_base, *map(str, paths)]
-                try:
-                    proc = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-                except subprocess.TimeoutExpired:
-                    for path in paths:
-                        results[str(path)] = {
-                            'raw': [],
-                            'errors': ['Linting timeout (60s)'],
-                            'score': 0
-                        }
-                    continue
-
-                if proc.returncode not in (0, 1):
-                    err = proc.stderr.strip() or "flake8 crash"
-                    for p in paths:
-                        results[str(p)] = {"raw": [], "errors":[err], "score":0}
-                    continue
-            
-                per_file = defaultdict(list)
-                for line in proc.stdout.splitlines():
-                    if not line: 
-                        continue
-                    path_part = line.split(':', 1)[0]
-                    per_file[path_part].append(line.split(':', 1)[1].strip())
-
-                for path in paths:
-                    raw  = per_file.get(str(path), [])
-                    issues = len(raw)
-                    results[str(path)] = {
-                        "raw": raw,
-                        "errors": [],
-                        "score": 100 - issues
-                    }
+        if quarantined:
+            print(f"Linting {len(quarantined)} quarantined files individually")
+            results.update(self._checkpointed(
+                quarantined, lambda chunk: self._scan_isolated(chunk, self._run_flake8, self.BATCH_TIMEOUT, 'Linting')
+            ))
+
+        return results
+
+    def _lint_chunk(self, batch: List[Path]) -> Dict[str, Any]:
+        """Lint one chunk of files with a single flake8 call per extension"""
+        results = {}
+        groups = defaultdict(list)
+        for path in batch:
+            groups[path.suffix].append(path)
+
+        for suffix, paths in groups.items():
+            if not self.COMMANDS.get(suffix):
+                continue
+            results.update(self._bisect_timeouts(paths, self._run_flake8, self.BATCH_TIMEOUT, self.FILE_TIMEOUT, 'Linting'))
 
+        return results
+
+    def _run_flake8(self, paths: List[Path], timeout: float) -> Dict[str, Any]:
+        """One flake8 call over files sharing an extension; raises TimeoutExpired for bisection"""
+        results = {}
+        cmd = [*self.COMMANDS[paths[0].suffix], *map(str, paths)]
+        proc = self._run_tool('flake8', cmd, timeout)
+
+        if proc.returncode not in (0, 1):
+            err = proc.stderr.strip() or "flake8 crash"
+            for p in paths:
+                results[str(p)] = {"raw": [], "errors":[err], "score":0, "transient": True}
+            return results
+    
+        per_file = defaultdict(list)
+        for line in proc.stdout.splitlines():
+            if not line: 
+                continue
+            path_part = line.split(':', 1)[0]
+            per_file[path_part].append(line.split(':', 1)[1].strip())
+
+        for path in paths:
+            raw  = per_file.get(str(path), [])
+            issues = len(raw)
+            results[str(path)] = {
+                "raw": raw,
+                "errors": [],
+                "score": 100 - issues
+            }
 
         return results
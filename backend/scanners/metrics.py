@@ -0,0 +1,206 @@
+from typing import Dict, Any, List, Optional, Tuple
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import bisect
+import os
+import threading
+import time
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DB_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SUBPROCESS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class _Metric:
+    """A named metric family with one series per label set"""
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple((name, str(labels[name])) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            for key, value in sorted(self._series.items()):
+                lines.extend(self._render_series(key, value))
+        return lines
+
+    def _render_series(self, key, value) -> List[str]:
+        return [f'{self.name}{_format_labels(key)} {_format_value(value)}']
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, amount: float = 1, **labels):
+        """Raise the gauge for the duration of a block, e.g. while a worker is busy"""
+        self.inc(amount, **labels)
+        try:
+            yield
+        finally:
+            self.dec(amount, **labels)
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DB_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+            series['counts'][bisect.bisect_left(self.buckets, value)] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe how long a block takes, including blocks that raise (e.g. timeouts)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _render_series(self, key, series) -> List[str]:
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float('inf'),), series['counts']):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{_format_labels(key, ("le", _format_value(bound)))} {cumulative}')
+        lines.append(f'{self.name}_sum{_format_labels(key)} {_format_value(series["sum"])}')
+        lines.append(f'{self.name}_count{_format_labels(key)} {series["count"]}')
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """The registry in Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+# Metrics are only recorded in the orchestrator process; pool workers run scan_single_file
+# on their own copy of this module, so per-file work is counted in the parent as results return
+REGISTRY = Registry()
+
+FILES_DISCOVERED = REGISTRY.register(Counter('codeiq_files_discovered_total', 'Files found by a scanner\'s discovery walk', ('scanner',)))
+FILES_SCANNED = REGISTRY.register(Counter('codeiq_files_scanned_total', 'Files a scanner has finished with', ('scanner',)))
+FILES_QUEUED = REGISTRY.register(Gauge('codeiq_files_queued', 'Files handed to a scanner and not yet finished', ('scanner',)))
+WORKERS_BUSY = REGISTRY.register(Gauge('codeiq_workers_busy', 'Workers or tool subprocesses currently running for a scanner', ('scanner',)))
+WORKERS_MAX = REGISTRY.register(Gauge('codeiq_workers_max', 'Configured worker count per scanner', ('scanner',)))
+SUBPROCESS_SECONDS = REGISTRY.register(Histogram(
+    'codeiq_subprocess_duration_seconds', 'Wall time of external tool runs', ('tool',), buckets=SUBPROCESS_BUCKETS
+))
+DB_WRITE_SECONDS = REGISTRY.register(Histogram('codeiq_db_write_duration_seconds', 'Latency of database writes', ('table',)))
+CACHE_REQUESTS = REGISTRY.register(Counter('codeiq_cache_requests_total', 'Cache lookups by cache and result', ('cache', 'result')))
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # scrapes every few seconds would drown the scan's own output
+
+def serve(port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """Serve /metrics from a daemon thread for the life of the process"""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving scan metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+def write_textfile(path: str):
+    """Write the registry atomically, for node_exporter's textfile collector"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        f.write(REGISTRY.render())
+    os.replace(tmp, path)
+
+class TextfileWriter:
+    """Rewrite a metrics textfile every few seconds until stopped, then once more with final values"""
+
+    def __init__(self, path: str, interval: float = 10):
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> 'TextfileWriter':
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        write_textfile(self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                write_textfile(self.path)
+            except OSError as e:
+                print(f"Warning: failed to write metrics to {self.path}: {e}")
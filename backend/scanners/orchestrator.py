@@ -2,13 +2,25 @@ from typing import Dict, Any, List, Optional
 from pathlib import Path
 import time
 import json
+import hashlib
 import argparse
 import threading
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from base_scanner import BaseScanner
 from linter import Linter
 from secrets_pii import Secrets
 from todo import Todos
+from complexity import Complexity
+from bandit_scanner import Bandit
+from dependencies import Dependencies
+from history import History
+from type_check import TypeCheck
+from journal import ScanJournal
+from content_index import ContentIndex
+from source_cache import SourceCache
+from quarantine import Quarantine
+from estimate import stratify, stratified_sample, stratified_mean, MIN_PER_STRATUM
+import metrics
 from collections import defaultdict
 from supabase import create_client
 from dotenv import load_dotenv
@@ -21,7 +33,8 @@ load_dotenv()
 class ScanOrchestrator:
     """Orchestrates multiple scanners for comprehensive code health analysis"""
 
-    def __init__(self, scan_id: str, max_concurrent_scanners: int = 3):
+    def __init__(self, scan_id: str, max_concurrent_scanners: int = 3, resume: bool = False, ignore_globs: Optional[List[str]] = None,
+                 quick_estimate: bool = False, sample_size: int = 200):
         self.scanners = {}
         self.scanner_types = defaultdict(list)
         self.max_concurrent_scanners = max_concurrent_scanners
@@ -29,14 +42,34 @@ class ScanOrchestrator:
         self.scan_id = scan_id
         self.supabase = create_client(os.getenv("DB_URL"), os.getenv("DB_KEY"))
         self.db_mutex = threading.Lock()
+        self.journal = ScanJournal(scan_id, resume=resume) # checkpoints finished work so --resume can skip it
+        self.content_index = None
+        self.source_cache = SourceCache()
+        self.state_root = os.getenv("SCAN_STATE_DIR", "./out/state") # per-repo state kept between scans
+        self.repo_id = None
+        self.quarantine = None
+        self.ignore_globs = ignore_globs or [] # applied by every scanner on top of the repo's ignore files
+        self.quick_estimate = quick_estimate # publish a sampled provisional score before the full scan finishes
+        self.sample_size = sample_size
+        self.all_files = None
 
     def register_scanner(self, scanner: BaseScanner, scanner_type: str):
         """Register a scanner with the orchestrator"""
         name = scanner.__class__.__name__
         self.scanners[name] = scanner
         self.scanner_types[scanner_type].append(name)
+        scanner.journal = self.journal
+        scanner.source_cache = self.source_cache
+        scanner.ignore_globs = self.ignore_globs
+        metrics.WORKERS_MAX.set(scanner.max_workers, scanner=name)
         
 
+    def get_repo_id(self) -> str:
+        """Repo snapshot this scan belongs to; stable across scans of the same repo"""
+        if self.repo_id is None:
+            self.repo_id = self.supabase.table("active_scans").select("repoSnapshotId").eq("id", self.scan_id).single().execute().data.get("repoSnapshotId")
+        return self.repo_id
+
     def run_single_scanner(self, name: str, scanner: BaseScanner, path: str) -> Dict[str, Any]:
         """Run a single scanner and return its results"""
         print(f"Starting {name} scanner...")
@@ -53,9 +86,10 @@ class ScanOrchestrator:
                     waiting.remove(name)
                 in_progress.append(name)
 
-                self.supabase.table('active_scans').update({
-                    "states": states
-                }).eq("id", self.scan_id).execute()
+                with metrics.DB_WRITE_SECONDS.time(table="active_scans"):
+                    self.supabase.table('active_scans').update({
+                        "states": states
+                    }).eq("id", self.scan_id).execute()
             
             # Send HTTP notification (outside mutex)
             try:
@@ -70,6 +104,7 @@ class ScanOrchestrator:
             
             # Run the actual scan (outside mutex - this is the long-running operation)
             result = scanner.scan(path)
+            self.journal.mark_complete(name, result)
             print(f"✓ {name} completed")
             
             # Acquire mutex again for completion state update
@@ -83,9 +118,10 @@ class ScanOrchestrator:
                     in_progress.remove(name)
                 completed.append(name)
                 
-                self.supabase.table('active_scans').update({
-                    "states": states
-                }).eq("id", self.scan_id).execute()
+                with metrics.DB_WRITE_SECONDS.time(table="active_scans"):
+                    self.supabase.table('active_scans').update({
+                        "states": states
+                    }).eq("id", self.scan_id).execute()
 
             # Send HTTP notification (outside mutex)
             try:
@@ -111,9 +147,10 @@ class ScanOrchestrator:
                         in_progress.remove(name)
                     failed.append(name)
 
-                    self.supabase.table('active_scans').update({
-                        "states": states
-                    }).eq("id", self.scan_id).execute()
+                    with metrics.DB_WRITE_SECONDS.time(table="active_scans"):
+                        self.supabase.table('active_scans').update({
+                            "states": states
+                        }).eq("id", self.scan_id).execute()
             except Exception as cleanup_error:
                 print(f"Warning: Failed to cleanup {name} from in_progress: {cleanup_error}")
 
@@ -134,29 +171,54 @@ class ScanOrchestrator:
         if scanners is None:
             scanners = list(self.scanners.keys())
 
+        if self.journal.scan_path is None:
+            self.journal.record_scan_path(path)
+        self.journal.set_root(path)
+
+        # Files that timed out on their own in earlier scans of this repo are scanned separately
+        state_dir = os.path.join(self.state_root, str(self.get_repo_id()))
+        self.quarantine = Quarantine(os.path.join(state_dir, "quarantine.json"), root=path)
+        for scanner in self.scanners.values():
+            scanner.quarantine = self.quarantine
+            scanner.state_dir = state_dir
+
+        # Scanners finished before an interruption are taken straight from the journal
+        resumed = [name for name in scanners if self.journal.is_complete(name)]
         states = {
-            "waiting": scanners,
+            "waiting": [name for name in scanners if name not in resumed],
             "inProgress": [],
-            "completed": [],
+            "completed": resumed,
             "failed": []
         }
-        self.supabase.table('active_scans').update({"states": states, "status": "running"}).eq("id", self.scan_id).execute()
+        with metrics.DB_WRITE_SECONDS.time(table="active_scans"):
+            self.supabase.table('active_scans').update({"states": states, "status": "running"}).eq("id", self.scan_id).execute()
 
         total_start_time = time.time()
         print(f"Starting comprehensive scan of: {path}")
         print(f"Running {len(scanners)} scanners: {', '.join(scanners)}")
+        self.build_content_index(path, [name for name in scanners if name in self.scanners and name not in resumed])
+        if resumed:
+            print(f"Skipping {len(resumed)} scanners completed before resume: {', '.join(resumed)}")
+
+        scanner_results = {name: self.journal.scanner_results(name) for name in resumed}
+        estimate = None
+        if self.quick_estimate:
+            estimate = self.run_sample(path, [name for name in scanners if name in self.scanners])
+            self.publish_estimate(estimate, scanner_results)
         
         # Run scanners concurrently (but limit concurrency to prevent system overload)
         with ThreadPoolExecutor(max_workers=self.max_concurrent_scanners) as executor:
             futures = {
                 executor.submit(self.run_single_scanner, name, self.scanners[name], path): name
-                for name in scanners if name in self.scanners
+                for name in scanners if name in self.scanners and name not in resumed
             }
 
-            scanner_results = {}
-            for future in futures:
+            for future in as_completed(futures):
                 name = futures[future]
                 scanner_results[name] = future.result()
+                if estimate is not None:
+                    # Each finished scanner replaces its sampled results with the real ones
+                    self.publish_estimate(estimate, scanner_results)
         
         total_time = time.time() - total_start_time
         
@@ -174,10 +236,211 @@ class ScanOrchestrator:
         self.results[path] = aggregated_results
         return aggregated_results
     
+    def discover_all(self, path: str) -> List[Path]:
+        """Every scannable file in the repo, walked once and shared by the orchestrator's own passes"""
+        if self.all_files is None:
+            # The base walk, not the scanner's: overrides such as Dependencies' manifest filter would narrow it
+            walker = next(iter(self.scanners.values()))
+            self.all_files = BaseScanner.discover_files(walker, path, ['*'])
+        return self.all_files
+
+    def run_sample(self, path: str, scanners: List[str]) -> Dict[str, Any]:
+        """Scan a stratified random sample of files with every per-file scanner"""
+        start = time.time()
+        base_path = Path(path).resolve()
+        files = {}
+        for file_path in self.discover_all(path):
+            try:
+                files[str(file_path.resolve().relative_to(base_path))] = file_path
+            except ValueError:
+                continue
+
+        # Bounded so per-stratum floors take at most half the sample, leaving the rest proportional
+        strata = stratify(list(files), max_strata=max(1, self.sample_size // (2 * MIN_PER_STRATUM)))
+        sample = stratified_sample(strata, self.sample_size)
+        sampled = [files[rel] for members in sample.values() for rel in members]
+
+        def scan_sample(name: str) -> Dict[str, Any]:
+            scanner = self.scanners[name]
+            extensions = scanner.get_file_extensions()
+            targets = [p for p in sampled if extensions == ['*'] or p.suffix in extensions]
+            # Sampled chunks never line up with the full scan's, so keep them out of the journal
+            journal, scanner.journal = scanner.journal, None
+            try:
+                metrics.FILES_QUEUED.inc(len(targets), scanner=name)
+                return scanner.scan_batch(targets) if targets else {}
+            except Exception as e:
+                print(f"Warning: sampling {name} failed: {e}")
+                return {}
+            finally:
+                scanner.journal = journal
+
+        samplers = [name for name in scanners if self.scanners[name].supports_sampling]
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_scanners) as executor:
+            sample_results = dict(zip(samplers, executor.map(scan_sample, samplers)))
+
+        print(f"Sampled {len(sampled)} of {len(files)} files across {len(strata)} strata in {time.time() - start:.2f}s")
+        return {
+            'path': path,
+            'scanners': scanners,
+            'strata_sizes': {key: len(members) for key, members in strata.items()},
+            'sample': sample,
+            'results': sample_results
+        }
+
+    def publish_estimate(self, estimate: Dict[str, Any], completed: Dict[str, Dict[str, Any]]):
+        """Publish provisional category averages: exact once all of a category's scanners are done,
+        otherwise a stratified estimate with a 95% confidence interval from the sampled files"""
+        merged = {**estimate['results'], **completed}
+        file_scores = self._score_files(self._generate_file_results(estimate['path'], merged))
+
+        categories = {}
+        for category in ('health', 'security', 'knowledge'):
+            members = [name for name in self.scanner_types.get(category, []) if name in estimate['scanners']]
+            if not members:
+                continue
+
+            if all(name in completed for name in members):
+                # Same averaging as generate_scores: files without a score don't count
+                values = [s[category].get('score') for s in file_scores.values() if s.get(category, {}).get('score')]
+                if values:
+                    mean = sum(values) / len(values)
+                    categories[category] = {'mean': mean, 'low': mean, 'high': mean, 'sampled': len(values), 'exact': True}
+                continue
+
+            values = {
+                key: [file_scores[rel][category]['score'] for rel in members_ if file_scores.get(rel, {}).get(category, {}).get('score')]
+                for key, members_ in estimate['sample'].items()
+            }
+            result = stratified_mean(estimate['strata_sizes'], values)
+            if result is not None:
+                categories[category] = result
+
+        payload = {
+            **categories,
+            'completedScanners': sorted(name for name in estimate['scanners'] if name in completed),
+            'updatedAt': datetime.now(timezone.utc).isoformat()
+        }
+        summary = ', '.join(f"{c} {v['mean']:.2f} [{v['low']:.2f}, {v['high']:.2f}]" for c, v in categories.items())
+        print(f"Provisional scores: {summary or 'none yet'}")
+        try:
+            with metrics.DB_WRITE_SECONDS.time(table="repo_snapshots"):
+                self.supabase.table("repo_snapshots").update({"scoreEstimate": payload}).eq("id", self.get_repo_id()).execute()
+        except Exception as e:
+            print(f"Warning: failed to publish provisional scores: {e}")
+
+    def build_content_index(self, path: str, scanners: List[str]):
+        """Sweep the repo once for every literal the content scanners need and share the index"""
+        literals = set()
+        for name in scanners:
+            literals.update(self.scanners[name].get_required_literals())
+        if not literals:
+            return
+
+        start = time.time()
+        # Files missing from the index (other scanners' exclusions) are treated as candidates
+        files = self.discover_all(path)
+        self.content_index = ContentIndex.build(files, literals, max_workers=self.scanners[scanners[0]].max_workers)
+        print(f"Content index built in {time.time() - start:.2f}s")
+
+        for name in scanners:
+            self.scanners[name].content_index = self.content_index
+
     def generate_scores(self, scanner_results: Dict[str, Dict[str, Any]], scan_path: str = None) -> Dict[str, Dict[str, Any]]:
         """Generate a summary of results for each file scanned"""
 
         file_out = self._generate_file_results(scan_path, scanner_results)
+        file_scores = self._score_files(file_out)
+
+        repo_id = self.get_repo_id()
+
+        health_total = []
+        security_total = []
+        knowledge_total = []
+        snapshot_rows = []
+        payloads = {}
+
+        for file, scan in file_scores.items():
+            health_score = scan.get('health', {}).get('score')
+            security_score = scan.get('security', {}).get('score')
+            knowledge_score = scan.get('knowledge', {}).get('score')
+
+            # Identical results (usually an unchanged file) are stored once and referenced by hash
+            results_hash = self._results_hash(scan)
+            payloads[results_hash] = scan
+            snapshot_rows.append({
+                "repoSnapshotId": repo_id,
+                "filePath": file,
+                "healthScore": health_score,
+                "securityScore": security_score,
+                "knowledgeScore": knowledge_score,
+                "resultsHash": results_hash
+            })
+
+            if health_score:
+                health_total.append(health_score)
+            if security_score:
+                security_total.append(security_score)
+            if knowledge_score:
+                knowledge_total.append(knowledge_score)
+
+        self._store_results(payloads)
+        for i in range(0, len(snapshot_rows), 500):
+            with metrics.DB_WRITE_SECONDS.time(table="file_snapshots"):
+                self.supabase.table("file_snapshots").insert(snapshot_rows[i:i + 500]).execute()
+
+        overall = []
+        health_avg = sum(health_total) / len(health_total) if health_total else None
+        if health_avg is not None:
+            overall.append(health_avg)
+        security_avg = sum(security_total) / len(security_total) if security_total else None
+        if security_avg is not None:
+            overall.append(security_avg)
+        knowledge_avg = sum(knowledge_total) / len(knowledge_total) if knowledge_total else None
+        if knowledge_avg is not None:
+            overall.append(knowledge_avg)
+        overall_avg = sum(overall) / len(overall) if overall else None
+
+        with metrics.DB_WRITE_SECONDS.time(table="active_scans"):
+            self.supabase.table("active_scans").update({
+                "status": "completed",
+                "completedAt": datetime.now(timezone.utc).isoformat()
+            }).eq("id", self.scan_id).execute()
+
+        previous_scores = self.supabase.table("repo_snapshots").select("healthScore, securityScore, knowledgeScore").eq("id", repo_id).single().execute().data
+
+        # Handle None values from database
+        prev_health = previous_scores.get("healthScore") or 0.0
+        prev_security = previous_scores.get("securityScore") or 0.0  
+        prev_knowledge = previous_scores.get("knowledgeScore") or 0.0
+        
+        prev_overall = (prev_health + prev_security + prev_knowledge) / 3 if previous_scores else 0.0
+        with metrics.DB_WRITE_SECONDS.time(table="repo_snapshots"):
+            self.supabase.table("repo_snapshots").update({
+                "healthScore": health_avg,
+                "securityScore": security_avg,
+                "knowledgeScore": knowledge_avg,
+                "trend": overall_avg - prev_overall if overall_avg is not None and prev_overall is not None else None,
+                "scoreEstimate": None, # the real scores supersede any provisional estimate
+            }).eq("id", repo_id).execute()
+
+        try:
+            requests.post(
+                f"{os.getenv('BACKEND_URL')}/scan/complete", 
+                headers={"Content-Type": "application/json"},
+                json={"scan_id": self.scan_id},
+                timeout=10
+            )
+        except requests.RequestException as e:
+            print(f"Warning: HTTP notification failed for completed scan: {e}")
+
+        # Everything is published, nothing left to resume
+        self.journal.discard()
+
+        return file_scores
+
+    def _score_files(self, file_out: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Per-file health, security and knowledge scores from each file's scanner results"""
         file_scores = defaultdict(dict)
         for file, out in file_out.items():
             # Get scanner lists with safe defaults
@@ -238,79 +501,40 @@ class ScanOrchestrator:
 
         file_scores = dict(file_scores)
         # print(file_scores)
-
-        repo_id = self.supabase.table("active_scans").select("repoSnapshotId").eq("id", self.scan_id).single().execute().data.get("repoSnapshotId")
-
-        health_total = []
-        security_total = []
-        knowledge_total = []
-
-        for file, scan in file_scores.items():
-            health_score = scan.get('health', {}).get('score')
-            security_score = scan.get('security', {}).get('score')
-            knowledge_score = scan.get('knowledge', {}).get('score')
-            
-            self.supabase.table("file_snapshots").insert({
-                "repoSnapshotId": repo_id,
-                "filePath": file,
-                "healthScore": health_score,
-                "securityScore": security_score,
-                "knowledgeScore": knowledge_score,
-                "scannerResults": scan
-            }).execute()
-
-            if health_score:
-                health_total.append(health_score)
-            if security_score:
-                security_total.append(security_score)
-            if knowledge_score:
-                knowledge_total.append(knowledge_score)
-
-        overall = []
-        health_avg = sum(health_total) / len(health_total) if health_total else None
-        if health_avg is not None:
-            overall.append(health_avg)
-        security_avg = sum(security_total) / len(security_total) if security_total else None
-        if security_avg is not None:
-            overall.append(security_avg)
-        knowledge_avg = sum(knowledge_total) / len(knowledge_total) if knowledge_total else None
-        if knowledge_avg is not None:
-            overall.append(knowledge_avg)
-        overall_avg = sum(overall) / len(overall) if overall else None
-
-        self.supabase.table("active_scans").update({
-            "status": "completed",
-            "completedAt": datetime.now(timezone.utc).isoformat()
-        }).eq("id", self.scan_id).execute()
-
-        previous_scores = self.supabase.table("repo_snapshots").select("healthScore, securityScore, knowledgeScore").eq("id", repo_id).single().execute().data
-
-        # Handle None values from database
-        prev_health = previous_scores.get("healthScore") or 0.0
-        prev_security = previous_scores.get("securityScore") or 0.0  
-        prev_knowledge = previous_scores.get("knowledgeScore") or 0.0
-        
-        prev_overall = (prev_health + prev_security + prev_knowledge) / 3 if previous_scores else 0.0
-        self.supabase.table("repo_snapshots").update({
-            "healthScore": health_avg,
-            "securityScore": security_avg,
-            "knowledgeScore": knowledge_avg,
-            "trend": overall_avg - prev_overall if overall_avg is not None and prev_overall is not None else None,
-        }).eq("id", repo_id).execute()
-
-        try:
-            requests.post(
-                f"{os.getenv('BACKEND_URL')}/scan/complete", 
-                headers={"Content-Type": "application/json"},
-                json={"scan_id": self.scan_id},
-                timeout=10
-            )
-        except requests.RequestException as e:
-            print(f"Warning: HTTP notification failed for completed scan: {e}")
-
-
         return file_scores
 
+    @staticmethod
+    def _results_hash(scan: Dict[str, Any]) -> str:
+        """Content address of a file's results; canonical JSON so key order doesn't matter"""
+        canonical = json.dumps(scan, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _store_results(self, payloads: Dict[str, Dict[str, Any]], chunk_size: int = 100):
+        """Upload only the result payloads the database doesn't already hold"""
+        hashes = list(payloads.keys())
+        existing = set()
+        for i in range(0, len(hashes), chunk_size):
+            rows = self.supabase.table("scanner_results").select("hash").in_("hash", hashes[i:i + chunk_size]).execute().data
+            existing.update(row["hash"] for row in rows)
+
+        missing = [{"hash": h, "results": payloads[h]} for h in hashes if h not in existing]
+        print(f"Scanner results: {len(existing)} reused, {len(missing)} new")
+        metrics.CACHE_REQUESTS.inc(len(existing), cache='results_dedup', result='hit')
+        metrics.CACHE_REQUESTS.inc(len(missing), cache='results_dedup', result='miss')
+        for i in range(0, len(missing), chunk_size):
+            # A concurrent scan may have inserted the same hash since the lookup
+            with metrics.DB_WRITE_SECONDS.time(table="scanner_results"):
+                self.supabase.table("scanner_results").upsert(missing[i:i + chunk_size], on_conflict="hash", ignore_duplicates=True).execute()
+
+    @staticmethod
+    def _strip_roots(text: Any, roots: List[str]) -> Any:
+        """Make paths in scanner output relative to the scanned root"""
+        if not isinstance(text, str):
+            return text
+        for root in roots:
+            text = text.replace(root + os.sep, '').replace(root, '.')
+        return text
+
     def _generate_file_results(self, scan_path: str, scanner_results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         file_out = defaultdict(dict)
         
@@ -319,6 +543,8 @@ class ScanOrchestrator:
             base_path = Path(scan_path).resolve()
         else:
             base_path = Path.cwd()
+        # The checkout is a fresh temp dir on every scan; keep it out of stored output so results deduplicate
+        roots = sorted({str(base_path), os.path.abspath(scan_path or '.')}, key=len, reverse=True)
         
         
         for scanner, result in scanner_results.items():
@@ -339,8 +565,8 @@ class ScanOrchestrator:
                 if isinstance(details, dict):
                     file_out[file_key][scanner] = {}
                     file_out[file_key][scanner]['score'] = details.get('score', 0)
-                    file_out[file_key][scanner]['raw'] = details.get('raw', [])
-                    file_out[file_key][scanner]['errors'] = details.get('errors', [])
+                    file_out[file_key][scanner]['raw'] = [self._strip_roots(line, roots) for line in details.get('raw', [])]
+                    file_out[file_key][scanner]['errors'] = [self._strip_roots(line, roots) for line in details.get('errors', [])]
                 else:
                     print(f"Warning: Invalid details format for {file} in {scanner}")
                     file_out[file_key][scanner] = {}
@@ -448,27 +674,48 @@ def main():
     parser = argparse.ArgumentParser(description="Codebase Scanner")
     parser.add_argument("--scan_id", help="ID of the scanner to use")
     parser.add_argument("--scan_path", help="Path of the codebase to scan")
+    parser.add_argument("--resume", metavar="SCAN_ID",
+                        help="Resume an interrupted scan from its local journal. The backend deletes the checkout when "
+                             "the scan process exits, so pass a fresh clone of the same commit with --scan_path")
+    parser.add_argument("--exclude", metavar="GLOB", action="append", default=[], help="Extra gitignore-style pattern to skip (repeatable)")
+    parser.add_argument("--quick-estimate", action="store_true", help="Publish sampled provisional scores before the full scan finishes")
+    parser.add_argument("--sample-size", type=int, default=200, help="Files to sample for the quick estimate")
+    parser.add_argument("--metrics-port", type=int, help="Serve live scan metrics in Prometheus format on this local port")
+    parser.add_argument("--metrics-textfile", metavar="PATH", help="Periodically write scan metrics in Prometheus format to this file")
     args = parser.parse_args()
+    if args.metrics_port is not None:
+        metrics.serve(args.metrics_port)
+    textfile = metrics.TextfileWriter(args.metrics_textfile).start() if args.metrics_textfile else None
     # Create orchestrator
-    orchestrator = ScanOrchestrator(max_concurrent_scanners=2, scan_id=args.scan_id)
+    scan_id = args.resume or args.scan_id
+    orchestrator = ScanOrchestrator(max_concurrent_scanners=2, scan_id=scan_id, resume=bool(args.resume), ignore_globs=args.exclude,
+                                    quick_estimate=args.quick_estimate, sample_size=args.sample_size)
+    scan_path = args.scan_path or orchestrator.journal.scan_path
+    if not scan_path:
+        parser.error("--scan_path is required unless resuming a journaled scan")
+    if not os.path.isdir(scan_path):
+        parser.error(f"{scan_path} no longer exists; re-clone the repo and pass it with --scan_path")
 
 
     # Register scanners
     orchestrator.register_scanner(Linter(max_workers=4), 'health')
     orchestrator.register_scanner(Secrets(max_workers=4), 'security')
     orchestrator.register_scanner(Todos(max_workers=4), 'knowledge')
-
-    # Add more scanners as they're implemented
-    # orchestrator.register_scanner(ComplexityScanner())
-    # orchestrator.register_scanner(SecurityScanner())
+    orchestrator.register_scanner(History(), 'knowledge')
+    orchestrator.register_scanner(Complexity(max_workers=4), 'health')
+    orchestrator.register_scanner(TypeCheck(), 'health')
+    orchestrator.register_scanner(Bandit(max_workers=4), 'security')
+    orchestrator.register_scanner(Dependencies(max_workers=4), 'security')
 
     # Run comprehensive scan
-    results = orchestrator.scan_codebase(args.scan_path)
+    results = orchestrator.scan_codebase(scan_path)
     # results = orchestrator.scan_codebase('.')
     if results and results['scanner_results']:
         # Extract scan path from results metadata for relative path conversion
         scan_path_from_results = results['scan_metadata']['path_scanned']
         raw_scores = orchestrator.generate_scores(results['scanner_results'], scan_path_from_results)
+    if textfile is not None:
+        textfile.stop()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,65 @@
+from typing import List, Tuple
+from pathlib import Path
+from datetime import datetime, timezone
+import json
+import os
+import threading
+
+class Quarantine:
+    """Per-repo list of files that timed out on their own, kept between scans.
+
+    Paths are stored relative to the scanned root because every scan works on a fresh checkout.
+    """
+
+    def __init__(self, path: str, root: str):
+        self.path = path
+        self.root = Path(root).resolve()
+        self.mutex = threading.Lock()
+        self.entries = {} # scanner name -> {relative path -> {reason, since}}
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.entries = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"Warning: ignoring unreadable quarantine list {path}: {e}")
+
+    def _relative(self, file_path: Path) -> str:
+        try:
+            return str(Path(file_path).resolve().relative_to(self.root))
+        except ValueError:
+            return str(file_path)
+
+    def contains(self, scanner: str, file_path: Path) -> bool:
+        return self._relative(file_path) in self.entries.get(scanner, {})
+
+    def split(self, scanner: str, file_paths: List[Path]) -> Tuple[List[Path], List[Path]]:
+        """Split files into (healthy, quarantined) for one scanner"""
+        healthy, quarantined = [], []
+        for path in file_paths:
+            (quarantined if self.contains(scanner, path) else healthy).append(path)
+        return healthy, quarantined
+
+    def add(self, scanner: str, file_path: Path, reason: str):
+        with self.mutex:
+            self.entries.setdefault(scanner, {})[self._relative(file_path)] = {
+                'reason': reason,
+                'since': datetime.now(timezone.utc).isoformat()
+            }
+            self._save()
+        print(f"Quarantined {file_path} for {scanner}: {reason}")
+
+    def remove(self, scanner: str, file_path: Path):
+        """Release a file that finished within its isolated budget"""
+        with self.mutex:
+            if self.entries.get(scanner, {}).pop(self._relative(file_path), None) is None:
+                return
+            self._save()
+        print(f"Released {file_path} from quarantine for {scanner}")
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp, self.path)
@@ -1,12 +1,15 @@
 from base_scanner import BaseScanner
 from typing import Dict, Any, List
 from pathlib import Path
-import subprocess
 from collections import defaultdict
 import json
 import os
+import metrics
 
 class Secrets(BaseScanner):
+    BATCH_TIMEOUT = 60 # seconds for one trufflehog call over a whole chunk, or over one quarantined file
+    FILE_TIMEOUT = 10 # floor when bisecting
+
     def __init__(self, max_workers=None, exclude_patterns=None):
         super().__init__(max_workers, exclude_patterns)
 
@@ -21,22 +24,46 @@ class Secrets(BaseScanner):
     def scan(self, path):
         # Test error for debugging
         # raise Exception("Test error in secrets scanner")
-        scanner_name = self.__class__.__name__
 
+        # Scan in chunks rather than one repo-wide trufflehog run, so a timeout only
+        # costs one chunk and finished chunks can be checkpointed for resume
         files = self.discover_files(path, self.get_file_extensions())
-        cmd = ["trufflehog3", "filesystem", "--json", path]
+        print(f"Found {len(files)} files with extensions {self.get_file_extensions()}")
+        metrics.FILES_DISCOVERED.inc(len(files), scanner=self.__class__.__name__)
+        if not files:
+            return {}
+
+        metrics.FILES_QUEUED.inc(len(files), scanner=self.__class__.__name__)
+        return self.scan_batch(files)
+
+    def scan_batch(self, file_paths: List[Path], batch_size: int = 500) -> Dict[str, Any]:
+        if not file_paths:
+            return {}
+
+        file_paths, quarantined = self._split_quarantined(file_paths)
+        results = {}
+        for i in range(0, len(file_paths), batch_size):
+            batch = file_paths[i:i + batch_size]
+            results.update(self._checkpointed(batch, self._scan_chunk))
+
+        if quarantined:
+            print(f"Scanning {len(quarantined)} quarantined files individually for secrets")
+            results.update(self._checkpointed(
+                quarantined, lambda chunk: self._scan_isolated(chunk, self._run_trufflehog, self.BATCH_TIMEOUT, 'Secrets scanning')
+            ))
+
+        return results
+
+    def _scan_chunk(self, batch: List[Path]) -> Dict[str, Any]:
+        """Run trufflehog over one chunk of files, bisecting it if it times out"""
+        return self._bisect_timeouts(batch, self._run_trufflehog, self.BATCH_TIMEOUT, self.FILE_TIMEOUT, 'Secrets scanning')
+
+    def _run_trufflehog(self, batch: List[Path], timeout: float) -> Dict[str, Any]:
+        """One trufflehog call over a set of files; raises TimeoutExpired for bisection"""
         results = {}
-        try:
-            proc = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
-        except subprocess.TimeoutExpired:
-            for path in files:
-                results[str(path)] = {
-                    'raw': [],
-                    'errors': ['Secrets scanning timeout (10 min)'],
-                    'score': 0
-                }
-            return
-        
+        cmd = ["trufflehog3", "filesystem", "--json", *[str(p) for p in batch]]
+        proc = self._run_tool('trufflehog3', cmd, timeout)
+
         per_file = defaultdict(list)
         for line in proc.stderr.splitlines():
             if not line:
@@ -47,11 +74,11 @@ class Secrets(BaseScanner):
             except json.JSONDecodeError:
                 continue
 
-            fpath = info.get("SourceMetadata", {}).get("Data", {}).get("Filesystem", {}).get("file")
-            if fpath:
-                per_file[fpath].append(line)
+            path = info.get("SourceMetadata", {}).get("Data", {}).get("Filesystem", {}).get("file")
+            if path:
+                per_file[path].append(line)
 
-        for path in files:
+        for path in batch:
             raw  = per_file.get(str(path), [])
             issues = len(raw)
             results[str(path)] = {
@@ -60,46 +87,4 @@ class Secrets(BaseScanner):
                 "score": 100 - issues
             }
 
-        # self.write_results(results)
         return results
-
-    def scan_batch(self, file_paths: List[Path], batch_size: int = 500) -> Dict[str, Any]:
-        if not file_paths:
-            return {}
-
-        results = {}
-        for i in range(0, len(file_paths), batch_size):
-            batch = file_paths[i:i + batch_size]
-            cmd = ["trufflehog3", "filesystem", "--json", *[str(p) for p in batch]]
-
-            try:
-                proc = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-            except subprocess.TimeoutExpired:
-                for path in batch:
-                    results[str(path)] = {
-                        'raw': [],
-                        'errors': ['Secrets scanning timeout (60s)'],
-                        'score': 0
-                    }
-                continue
-
-            per_file = defaultdict(list)
-            for line in proc.stderr.splitlines():
-                if not line:
-                    continue
-
-                info = json.loads(line)
-                path = info.get("SourceMetadata", {}).get("Data", {}).get("Filesystem", {}).get("file")
-                if path:
-                    per_file[path].append(line)
-
-            for path in batch:
-                raw  = per_file.get(str(path), [])
-                issues = len(raw)
-                results[str(path)] = {
-                    "raw": raw,
-                    "errors": [],
-                    "score": 100 - issues
-                }
-
-        return results
\ No newline at end of file
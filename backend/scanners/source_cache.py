@@ -0,0 +1,35 @@
+from typing import Tuple
+from pathlib import Path
+from collections import OrderedDict
+from importlib.util import decode_source
+import ast
+import hashlib
+
+# Process-local: pool workers keep recently parsed trees between tasks
+_memo = OrderedDict()
+_MEMO_SIZE = 256
+
+class SourceCache:
+    """Parse-once cache of Python sources shared by every Python analyzer in a scan.
+
+    Entries are keyed by the SHA-256 of the file contents and kept in memory per process.
+    There is no disk layer: unpickling a tree costs about as much as parsing the source again.
+    """
+
+    def get(self, path: Path) -> Tuple[str, ast.Module]:
+        """Return (source, AST) for a Python file, parsing it at most once per worker"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+
+        if digest in _memo:
+            _memo.move_to_end(digest)
+            return _memo[digest]
+
+        source = decode_source(data)
+        tree = ast.parse(source, filename=str(path))
+
+        _memo[digest] = (source, tree)
+        if len(_memo) > _MEMO_SIZE:
+            _memo.popitem(last=False)
+        return source, tree
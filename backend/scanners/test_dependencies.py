@@ -0,0 +1,136 @@
+from advisory_db import normalize_package, version_key, version_matches
+from dependencies import Dependencies, parse_package_lock, parse_package_json, parse_requirements
+
+LOCK_V1 = '''{
+  "name": "app",
+  "lockfileVersion": 1,
+  "dependencies": {
+    "lodash": {
+      "version": "4.17.15",
+      "resolved": "https://registry.npmjs.org/lodash/-/lodash-4.17.15.tgz"
+    },
+    "mkdirp": {
+      "version": "0.5.1",
+      "requires": {
+        "minimist": "0.0.8"
+      },
+      "dependencies": {
+        "minimist": {
+          "version": "0.0.8"
+        }
+      }
+    }
+  }
+}
+'''
+
+LOCK_V2 = '''{
+  "name": "app",
+  "lockfileVersion": 2,
+  "packages": {
+    "": {
+      "name": "app",
+      "dependencies": {
+        "lodash": "^4.17.0"
+      }
+    },
+    "node_modules/lodash": {
+      "version": "4.17.15"
+    },
+    "node_modules/mkdirp/node_modules/minimist": {
+      "version": "0.0.8"
+    },
+    "node_modules/@scope/pkg": {
+      "version": "1.0.0-beta.2"
+    }
+  },
+  "dependencies": {
+    "lodash": {
+      "version": "4.17.15"
+    },
+    "@scope/pkg": {
+      "version": "1.0.0-beta.2"
+    }
+  }
+}
+'''
+
+PACKAGE_JSON = '''{
+  "name": "app",
+  "version": "1.0.0",
+  "dependencies": {
+    "lodash": "^4.17.0",
+    "left-pad": "1.3.0",
+    "chalk": "=v2.4.1"
+  },
+  "devDependencies": {
+    "jest": "~29.0.0",
+    "eslint": "8.0.0-rc.1"
+  }
+}
+'''
+
+def packages(parsed):
+    return [(name, version) for _, _, name, version in parsed]
+
+def test_pypi_versions_follow_pep_440():
+    assert version_key('1.0rc1', 'pypi') < version_key('1.0', 'pypi') < version_key('1.0.post1', 'pypi')
+    assert version_key('1.0', 'pypi') == version_key('1.0.0', 'pypi')
+    assert version_key('2.0.0', 'pypi') < version_key('2.0.0+cu118', 'pypi')
+    assert version_key('1.9', 'pypi') < version_key('1.10', 'pypi')
+
+def test_npm_versions_follow_semver_precedence():
+    ordered = ['1.0.0-alpha', '1.0.0-alpha.1', '1.0.0-alpha.beta', '1.0.0-beta', '1.0.0-beta.2',
+               '1.0.0-beta.9', '1.0.0-beta.10', '1.0.0-rc.1', '1.0.0']
+    keys = [version_key(v, 'npm') for v in ordered]
+    assert keys == sorted(keys)
+    assert version_key('1.0.0+build.5', 'npm') == version_key('1.0.0', 'npm')
+
+def test_version_matches_constraint_lists():
+    assert version_matches('1.2.0', '>=1.0,<1.4.2', 'pypi')
+    assert not version_matches('1.4.2', '>=1.0,<1.4.2', 'pypi')
+    assert not version_matches('1.0.post1', '<1.0', 'pypi')
+    assert not version_matches('2.0.0+cu118', '<2.0.0', 'pypi')
+    assert version_matches('1.0rc1', '<1.0', 'pypi')
+    assert version_matches('1.4.7', '==1.4.*', 'pypi')
+    assert not version_matches('1.40', '==1.4.*', 'pypi')
+    assert version_matches('1.0.0-beta.9', '<1.0.0-beta.10', 'npm')
+    assert not version_matches('4.17.21', '<4.17.21', 'npm')
+
+def test_unparseable_versions_sort_first():
+    assert version_key('not-a-version', 'pypi') < version_key('0.0.1', 'pypi')
+    assert version_key('latest', 'npm') < version_key('0.0.1', 'npm')
+
+def test_package_names_normalize_per_ecosystem():
+    assert normalize_package('pypi', 'Django_REST.framework') == 'django-rest-framework'
+    assert normalize_package('npm', '@Scope/Pkg') == '@scope/pkg'
+
+def test_lockfile_v1_reads_nested_dependencies():
+    assert packages(parse_package_lock(LOCK_V1.splitlines())) == [
+        ('lodash', '4.17.15'), ('mkdirp', '0.5.1'), ('minimist', '0.0.8')
+    ]
+
+def test_lockfile_v2_reports_each_package_once():
+    parsed = list(parse_package_lock(LOCK_V2.splitlines()))
+    assert packages(parsed) == [('lodash', '4.17.15'), ('minimist', '0.0.8'), ('@scope/pkg', '1.0.0-beta.2')]
+    # Line numbers point into the `packages` section, where each entry appears first
+    assert parsed[0][0] == 12
+
+def test_package_json_only_checks_exact_pins():
+    assert packages(parse_package_json(PACKAGE_JSON.splitlines())) == [
+        ('left-pad', '1.3.0'), ('chalk', '2.4.1'), ('eslint', '8.0.0-rc.1')
+    ]
+
+def test_requirements_only_checks_exact_pins():
+    lines = ['Django==3.2.1  # web', 'requests>=2.0', '-r other.txt', '# comment', 'numpy[extra]===1.21.0', 'flask == 2.0.1']
+    assert packages(parse_requirements(lines)) == [('Django', '3.2.1'), ('numpy', '1.21.0'), ('flask', '2.0.1')]
+
+def test_package_json_next_to_a_lockfile_is_not_scanned(tmp_path):
+    for rel in ('locked/package.json', 'locked/package-lock.json', 'bare/package.json', 'bare/notes.json', 'requirements-dev.txt'):
+        (tmp_path / rel).parent.mkdir(exist_ok=True)
+        (tmp_path / rel).write_text('{}\n')
+
+    found = Dependencies(max_workers=1).discover_files(str(tmp_path), ['.txt', '.json'])
+    assert sorted(str(p.relative_to(tmp_path)) for p in found) == [
+        'bare/package.json', 'locked/package-lock.json', 'requirements-dev.txt'
+    ]
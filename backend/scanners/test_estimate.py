@@ -0,0 +1,67 @@
+from estimate import stratify, stratified_sample, stratified_mean, OTHER_STRATUM, MIN_PER_STRATUM
+import random
+
+def sizes(strata):
+    return {key: len(members) for key, members in strata.items()}
+
+def test_strata_are_top_level_directory_and_extension():
+    strata = stratify(['src/a.py', 'src/deep/b.py', 'src/c.js', 'setup.py'])
+    assert sizes(strata) == {('src', '.py'): 2, ('src', '.js'): 1, ('.', '.py'): 1}
+
+def test_tail_strata_merge_into_other():
+    files = [f'd{i}/f{j}.py' for i in range(10) for j in range(i + 1)]
+    strata = stratify(files, max_strata=4)
+    assert len(strata) == 4
+    assert sizes(strata)[('d9', '.py')] == 10
+    assert OTHER_STRATUM in strata
+    assert sorted(f for members in strata.values() for f in members) == sorted(files)
+
+def test_sample_size_is_a_target_not_a_floor():
+    files = [f'd{i}/f{j}.py' for i in range(1200) for j in range(3)]
+    strata = stratify(files, max_strata=200 // (2 * MIN_PER_STRATUM))
+    sample = stratified_sample(strata, 200, seed=1)
+    assert sum(len(members) for members in sample.values()) == 200
+
+def test_allocation_sums_to_sample_size_with_a_floor_per_stratum():
+    strata = {('a', '.py'): [f'a{i}' for i in range(1000)], ('b', '.py'): [f'b{i}' for i in range(30)], ('c', '.py'): ['c0']}
+    sample = stratified_sample(strata, 50, seed=3)
+    assert sum(len(members) for members in sample.values()) == 50
+    assert len(sample[('b', '.py')]) >= MIN_PER_STRATUM
+    assert sample[('c', '.py')] == ['c0']
+    assert all(set(sample[key]) <= set(strata[key]) for key in strata)
+
+def test_sampling_is_reproducible_with_a_seed():
+    strata = stratify([f'd{i % 7}/f{i}.py' for i in range(500)])
+    assert stratified_sample(strata, 40, seed=9) == stratified_sample(strata, 40, seed=9)
+
+def test_fully_sampled_population_gives_the_exact_mean():
+    values = {('a', ''): [1.0, 3.0], ('b', ''): [10.0, 10.0, 10.0]}
+    result = stratified_mean({('a', ''): 2, ('b', ''): 3}, values)
+    assert result['mean'] == (1 + 3 + 30) / 5
+    assert result['low'] == result['high'] == result['mean']
+
+def test_single_value_strata_still_have_an_interval():
+    rng = random.Random(0)
+    strata_sizes = {(f'd{i}', ''): 20 for i in range(300)}
+    values = {key: [rng.uniform(0, 10)] for key in strata_sizes}
+    result = stratified_mean(strata_sizes, values)
+    assert result['low'] < result['mean'] < result['high']
+    assert not result['exact']
+
+def test_too_few_values_give_no_estimate():
+    assert stratified_mean({('a', ''): 10}, {('a', ''): [5.0]}) is None
+    assert stratified_mean({('a', ''): 10}, {('a', ''): []}) is None
+
+def test_interval_covers_the_population_mean():
+    rng = random.Random(1)
+    files = [f'd{i % 40}/f{i}.py' for i in range(4000)]
+    truth = {f: (int(f[1:f.index('/')]) % 5) + rng.uniform(0, 3) for f in files}
+    population_mean = sum(truth.values()) / len(truth)
+    strata = stratify(files, max_strata=50)
+
+    covered = 0
+    for seed in range(200):
+        sample = stratified_sample(strata, 200, seed=seed)
+        result = stratified_mean(sizes(strata), {key: [truth[f] for f in members] for key, members in sample.items()})
+        covered += result['low'] <= population_mean <= result['high']
+    assert covered / 200 >= 0.9
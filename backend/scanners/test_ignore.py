@@ -0,0 +1,101 @@
+from ignore import IgnoreMatcher, translate_glob
+from todo import Todos
+import re
+
+def matcher(*patterns):
+    m = IgnoreMatcher()
+    m.add_patterns(patterns)
+    return m
+
+def discovered(root, **kwargs):
+    scanner = Todos(max_workers=1)
+    for name, value in kwargs.items():
+        setattr(scanner, name, value)
+    return sorted(str(p.relative_to(root)) for p in scanner.discover_files(str(root), ['*']))
+
+def test_unanchored_patterns_match_at_any_depth():
+    m = matcher('*.log', 'secret.txt')
+    assert m.match('app.log')
+    assert m.match('a/b/app.log')
+    assert m.match('a/secret.txt')
+    assert not m.match('app.log.txt')
+
+def test_negation_reincludes_files():
+    m = matcher('*.log', '!keep.log')
+    assert m.match('a.log')
+    assert not m.match('keep.log')
+    assert not m.match('dir/keep.log')
+
+def test_later_rules_win():
+    m = matcher('!keep.log', '*.log')
+    assert m.match('keep.log')
+
+def test_slash_anchors_to_the_ignore_file():
+    m = matcher('/build', 'docs/*.md')
+    assert m.match('build', is_dir=True)
+    assert not m.match('src/build', is_dir=True)
+    assert m.match('docs/a.md')
+    assert not m.match('x/docs/a.md')
+    assert not m.match('docs/sub/a.md')
+
+def test_double_star():
+    m = matcher('a/**/b', '**/foo', 'logs/**')
+    assert m.match('a/b')
+    assert m.match('a/x/y/b')
+    assert m.match('foo')
+    assert m.match('x/y/foo')
+    assert m.match('logs/a/b.txt')
+    assert not m.match('logs', is_dir=True)
+
+def test_directory_only_patterns_skip_files():
+    m = matcher('tmp/')
+    assert m.match('tmp', is_dir=True)
+    assert m.match('src/tmp', is_dir=True)
+    assert not m.match('tmp')
+
+def test_is_ignored_checks_parent_directories():
+    m = matcher('build/')
+    assert m.is_ignored('build/out/x.py')
+    assert not m.match('build/out/x.py')
+
+def test_escapes_and_character_classes():
+    m = matcher('\\#notes', '\\!bang', '[ab].txt', '[!c]d.txt')
+    assert m.match('#notes')
+    assert m.match('!bang')
+    assert m.match('a.txt') and m.match('b.txt') and not m.match('c.txt')
+    assert m.match('xd.txt') and not m.match('cd.txt')
+
+def test_comments_and_blank_lines_are_ignored():
+    m = matcher('# *.py', '', '   ')
+    assert not m.match('a.py')
+
+def test_translate_glob_stays_within_one_component():
+    assert re.fullmatch(translate_glob('*.py'), 'a.py')
+    assert not re.fullmatch(translate_glob('*.py'), 'a/b.py')
+    assert re.fullmatch(translate_glob('?.py'), 'a.py')
+
+def test_discovery_applies_nested_gitignore_files(tmp_path):
+    (tmp_path / '.gitignore').write_text('*.tmp\n/local.py\n')
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'sub' / '.gitignore').write_text('local.py\n!keep.tmp\n')
+    for rel in ('a.py', 'x.tmp', 'local.py', 'sub/local.py', 'sub/keep.tmp', 'sub/drop.tmp', 'sub/b.py'):
+        (tmp_path / rel).write_text('x\n')
+
+    assert discovered(tmp_path) == ['.gitignore', 'a.py', 'sub/.gitignore', 'sub/b.py', 'sub/keep.tmp']
+
+def test_files_in_ignored_directories_cannot_be_reincluded(tmp_path):
+    (tmp_path / '.gitignore').write_text('logs/\n!logs/keep.txt\n')
+    (tmp_path / 'logs').mkdir()
+    (tmp_path / 'logs' / 'keep.txt').write_text('x\n')
+    (tmp_path / 'a.py').write_text('x\n')
+
+    assert discovered(tmp_path) == ['.gitignore', 'a.py']
+
+def test_codeiqignore_and_user_globs_override_the_repo(tmp_path):
+    (tmp_path / '.gitignore').write_text('*.gen.py\n')
+    (tmp_path / '.codeiqignore').write_text('!kept.gen.py\nvendor/\n')
+    (tmp_path / 'vendor').mkdir()
+    for rel in ('a.py', 'b.gen.py', 'kept.gen.py', 'vendor/lib.py', 'notes.md'):
+        (tmp_path / rel).write_text('x\n')
+
+    assert discovered(tmp_path, ignore_globs=['*.md']) == ['.codeiqignore', '.gitignore', 'a.py', 'kept.gen.py']
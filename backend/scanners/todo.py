@@ -8,6 +8,17 @@ import json
 import os
 
 class Todos(BaseScanner):
+    PATTERNS = [
+        r'#.*?TODO.*',      # Python: # TODO: fix this
+        r'""".*?TODO.*?"""', # Python: """ TODO: fix this """
+        r'\'\'\'.*?TODO.*?\'\'\'', # Python: ''' TODO: fix this '''
+        # r'#.*?FIXME.*',     # Python: # FIXME: broken logic, will implement in different scanner
+        r'//.*?TODO.*',     # JavaScript/C++: // TODO: implement
+        r'/\*.*?TODO.*?\*/', # Multi-line: /* TODO: refactor */
+    ]
+    # Line breaks str.splitlines honours besides '\n'; files containing them take the full scan
+    OTHER_BREAKS = re.compile('[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
     def __init__(self, max_workers=None, exclude_patterns=None):
         super().__init__(max_workers, exclude_patterns)
 
@@ -29,19 +40,12 @@ class Todos(BaseScanner):
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-                patterns = [
-                    r'#.*?TODO.*',      # Python: # TODO: fix this
-                    r'""".*?TODO.*?"""', # Python: """ TODO: fix this """
-                    r'\'\'\'.*?TODO.*?\'\'\'', # Python: ''' TODO: fix this '''
-                    # r'#.*?FIXME.*',     # Python: # FIXME: broken logic, will implement in different scanner
-                    r'//.*?TODO.*',     # JavaScript/C++: // TODO: implement
-                    r'/\*.*?TODO.*?\*/', # Multi-line: /* TODO: refactor */
-                ]
                 todos = []
                 for line_num, line in enumerate(content.splitlines(), start=1):
-                    for pattern in patterns:
-                        if match := re.search(pattern, line, re.IGNORECASE):
-                            todos.append(f'{line_num}:{match.start()}: TODO Found:  \'{match.group()}\'')
+                    # Every pattern needs the marker, so cheaply skip lines without it
+                    if 'todo' not in line.lower():
+                        continue
+                    todos.extend(self._match_line(line_num, line))
 
                 result[str(file_path)]['raw'] = todos
                 result[str(file_path)]['score'] = 100-len(todos)
@@ -49,5 +53,48 @@ class Todos(BaseScanner):
             result[str(file_path)]['errors'].append(f'Error reading file: {str(e)}')
         
         return result
+
+    def _match_line(self, line_num: int, line: str) -> List[str]:
+        todos = []
+        for pattern in self.PATTERNS:
+            if match := re.search(pattern, line, re.IGNORECASE):
+                todos.append(f'{line_num}:{match.start()}: TODO Found:  \'{match.group()}\'')
+        return todos
+
+    def scan_candidate(self, file_path: Path, offsets: Dict[str, List[int]]) -> Dict[str, Any]:
+        """Check only the lines the content index found the marker on"""
+        try:
+            with open(file_path, 'rb') as f:
+                content = f.read()
+            text = content.decode('utf-8')
+        except Exception:
+            return self._find_todos(file_path) # reports the read error the usual way
+
+        if self.OTHER_BREAKS.search(text):
+            return self._find_todos(file_path)
+
+        todos = []
+        line_num, pos = 1, 0
+        for offset in sorted({o for hits in offsets.values() for o in hits}):
+            if offset < pos:
+                continue # another marker on a line already checked
+            start = content.rfind(b'\n', 0, offset) + 1
+            end = content.find(b'\n', offset)
+            end = len(content) if end == -1 else end
+            line_num += content.count(b'\n', pos, start)
+            todos.extend(self._match_line(line_num, content[start:end].decode('utf-8')))
+            pos = end
+
+        return {
+            str(file_path): {
+                'raw': todos,
+                'errors': [],
+                'score': 100-len(todos)
+            }
+        }
+
     def get_file_extensions(self):
-        return ["*"]
\ No newline at end of file
+        return ["*"]
+
+    def get_required_literals(self) -> List[str]:
+        return ["TODO"]
\ No newline at end of file
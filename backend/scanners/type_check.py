@@ -0,0 +1,89 @@
+from base_scanner import BaseScanner
+from typing import Dict, Any, List, Tuple
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import os
+import re
+import metrics
+
+_ERROR_LINE = re.compile(r'^(.+?):(\d+):(\d+): error: (.+?)(?:\s+\[([a-z0-9-]+)\])?$')
+_DUPLICATE_MODULE = re.compile(r'^(.+?): error: Duplicate module named')
+MAX_DUPLICATE_RETRIES = 5
+
+def _run_mypy(root: str, args: List[str]) -> Tuple[str, str, int]:
+    """Run mypy's API from the scanned root so the paths recorded in its cache stay stable.
+    Runs in its own process because it changes the working directory."""
+    from mypy import api
+
+    os.chdir(root)
+    return api.run(args)
+
+class TypeCheck(BaseScanner):
+    """Static type errors from mypy, re-checking only what changed via a persistent per-repo cache"""
+    supports_sampling = False # whole-program analysis
+
+    def __init__(self, max_workers=None, exclude_patterns=None):
+        super().__init__(max_workers, exclude_patterns)
+
+    def get_file_extensions(self) -> List[str]:
+        return ['.py']
+
+    def scan_single_file(self, file_path: Path) -> Dict[str, Any]:
+        """mypy checks the whole program at once; see scan()"""
+        return {}
+
+    def scan(self, path: str):
+        files = self.discover_files(path, self.get_file_extensions())
+        print(f"Found {len(files)} files with extensions {self.get_file_extensions()}")
+        metrics.FILES_DISCOVERED.inc(len(files), scanner=self.__class__.__name__)
+        if not files:
+            return {}
+
+        root = Path(path).resolve()
+        targets = {}
+        for file_path in files:
+            try:
+                targets[str(file_path.resolve().relative_to(root))] = str(file_path)
+            except ValueError:
+                continue
+
+        # The cache outlives the checkout, so the next scan only re-analyzes changed modules and their dependents
+        cache_dir = os.path.abspath(os.path.join(self.state_dir, 'mypy_cache')) if self.state_dir else os.devnull
+        options = [
+            '--incremental', '--cache-dir', cache_dir,
+            '--show-column-numbers', '--show-error-codes', '--no-error-summary', '--no-pretty',
+            '--ignore-missing-imports', '--follow-imports=silent', '--explicit-package-bases'
+        ]
+
+        checked = sorted(targets)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            for _ in range(MAX_DUPLICATE_RETRIES):
+                with metrics.SUBPROCESS_SECONDS.time(tool='mypy'), metrics.WORKERS_BUSY.track(scanner=self.__class__.__name__):
+                    stdout, stderr, status = executor.submit(_run_mypy, str(root), options + checked).result()
+                duplicates = {m.group(1) for m in map(_DUPLICATE_MODULE.match, stdout.splitlines()) if m}
+                if status != 2 or not duplicates:
+                    break
+                # Loose scripts sharing a module name abort the whole run; check the rest without them
+                print(f"Warning: skipping {len(duplicates)} files with duplicate module names: {', '.join(sorted(duplicates))}")
+                checked = [rel for rel in checked if rel not in duplicates]
+
+        if status == 2:
+            print(f"Warning: mypy failed on {path}: {(stderr or stdout).strip()}")
+            return {}
+
+        per_file = {rel: [] for rel in checked}
+        for line in stdout.splitlines():
+            match = _ERROR_LINE.match(line)
+            if match and match.group(1) in per_file:
+                rel, row, col, message, code = match.groups()
+                per_file[rel].append(f'{row}:{col}: [{code or "misc"}]: {message}')
+
+        metrics.FILES_SCANNED.inc(len(per_file), scanner=self.__class__.__name__)
+        results = {}
+        for rel, raw in per_file.items():
+            results[targets[rel]] = {
+                'raw': raw,
+                'errors': [],
+                'score': 100 - len(raw)
+            }
+        return results
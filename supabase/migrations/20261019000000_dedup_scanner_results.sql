@@ -0,0 +1,11 @@
+CREATE TABLE IF NOT EXISTS scanner_results (
+    "hash" text PRIMARY KEY,
+    "results" jsonb NOT NULL,
+    "createdAt" timestamptz NOT NULL DEFAULT now()
+);
+
+ALTER TABLE file_snapshots
+ADD COLUMN "resultsHash" text REFERENCES scanner_results("hash");
+
+ALTER TABLE file_snapshots
+ALTER COLUMN "scannerResults" DROP NOT NULL;
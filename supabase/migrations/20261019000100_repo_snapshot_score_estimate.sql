@@ -0,0 +1,2 @@
+ALTER TABLE repo_snapshots
+ADD COLUMN "scoreEstimate" jsonb;